@@ -3,59 +3,83 @@
 from future.standard_library import install_aliases  # isort:skip to keep 'install_aliases()'
 install_aliases()
 
-import codecs
+import copy
 import json
 import logging
 import os.path
 import sys
-import errno
-from urllib.parse import quote, unquote, urljoin
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from sortedcontainers import SortedDict
 
+from openqa_review.cache import (  # noqa: F401 part of the API
+    JOB_STORE_FILENAME, STORE_BACKENDS, HTTPCache, JobStore, LRUCache, filename_to_url, job_artifact, open_store, parse_ttls, ttl_spec, url_to_filename,
+    url_ttl)
+
 logging.basicConfig()
 log = logging.getLogger(sys.argv[0] if __name__ == "__main__" else __name__)
 logging.captureWarnings(True)  # see https://urllib3.readthedocs.org/en/latest/security.html#disabling-warnings
 
+# default upper limit of concurrent requests issued by one browser object
+MAX_CONNECTIONS = 4
+
+# default memory budget of the in-memory cache in bytes
+MEMORY_CACHE_SIZE = 256 * 1024 ** 2
+
+# default maximum age in days of jobs in the job cache since their last access
+JOB_CACHE_MAX_AGE = 30
+
+# parsed documents take a multiple of the memory of their source
+SOUP_SIZE_FACTOR = 10
+
+# default timeouts in seconds for establishing a connection and between received data
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 60
+
+# number of tries of requests failing with a temporary server error and the
+# delay in seconds before the first retry, doubled for each further retry
+MAX_TRIES = 6
+RETRY_DELAY = 1
+
 
 class DownloadError(Exception):
     """content could not be downloaded as requested."""
     pass
 
 
-class CacheNotFoundError(DownloadError):
-    """content could not retrieved from cache."""
+class NotFoundError(DownloadError):
+    """content does not exist on the server, e.g. an API not provided by older versions."""
     pass
 
 
-def url_to_filename(url):
-    """
-    Convert URL to a valid, unambigous filename.
-
-    >>> url_to_filename('http://openqa.opensuse.org/tests/foo/3')
-    'http%3A::openqa.opensuse.org:tests:foo:3'
-    """
-    return quote(url).replace('/', ':')
-
+class CacheNotFoundError(DownloadError):
+    """content could not retrieved from cache."""
+    pass
 
-def filename_to_url(name):
-    """
-    Convert filename generated by 'url_to_filename' back to valid URL.
 
-    >>> str(filename_to_url('http%3A::openqa.opensuse.org:tests:foo:3'))
-    'http://openqa.opensuse.org/tests/foo/3'
-    """
-    return unquote(name.replace(':', '/'))
+class DeadlineExceededError(DownloadError):
+    """content could not be downloaded before the deadline of the run, see '--deadline'."""
+    pass
 
 
 class Browser(object):
 
     """download relative or absolute url and return soup."""
 
-    def __init__(self, args, root_url, auth=None):
-        """Construct a browser object with options."""
+    def __init__(self, args, root_url, auth=None, max_connections=None):
+        """Construct a browser object with options.
+
+        'max_connections' overrides the corresponding command line option,
+        e.g. for host specific limits.
+        """
+        self._options = (args, root_url, auth, max_connections)
         self.save = args.save if hasattr(args, 'save') else False
         self.load = args.load if hasattr(args, 'load') else False
         self.load_dir = args.load_dir if hasattr(args, 'load_dir') else '.'
@@ -63,12 +87,172 @@ class Browser(object):
         self.dry_run = args.dry_run if hasattr(args, 'dry_run') else False
         self.root_url = root_url
         self.auth = auth
-        self.cache = {}
+        if max_connections is None:
+            max_connections = args.max_connections if hasattr(args, 'max_connections') else MAX_CONNECTIONS
+        self.max_connections = max(1, int(max_connections))
+        self.keep_alive = args.keep_alive if hasattr(args, 'keep_alive') else True
+        self.timeout = (args.connect_timeout if hasattr(args, 'connect_timeout') else CONNECT_TIMEOUT,
+                        args.read_timeout if hasattr(args, 'read_timeout') else READ_TIMEOUT)
+        # error messages of URLs which could not be retrieved so that they are not tried again
+        self.failed = {}
+        # APIs found not to be provided by the server so that callers do not try them again, see 'expire'
+        self.missing_apis = set()
+        backend = args.cache_backend if hasattr(args, 'cache_backend') else 'directory'
+        max_size = args.cache_max_size if hasattr(args, 'cache_max_size') else None
+        self.load_store = open_store(self.load_dir, backend) if self.load else None
+        self.save_store = open_store(self.save_dir, backend, max_size) if self.save else None
+        cache_dir = args.cache_dir if hasattr(args, 'cache_dir') else None
+        self.ttls = parse_ttls(args.cache_ttl if hasattr(args, 'cache_ttl') else None)
+        self.http_cache = HTTPCache(open_store(cache_dir, backend, max_size), self.ttls) if cache_dir else None
+        job_cache_dir = args.job_cache_dir if hasattr(args, 'job_cache_dir') else None
+        self.job_store = JobStore(os.path.join(job_cache_dir, JOB_STORE_FILENAME)) if job_cache_dir else None
+        # IDs of jobs known to be done, only their artifacts never change, see 'add_finished_jobs'
+        self.finished_jobs = set()
+        self.cache = LRUCache(args.memory_cache_size if hasattr(args, 'memory_cache_size') else MEMORY_CACHE_SIZE)
+        self.cache_parsed = args.cache_parsed if hasattr(args, 'cache_parsed') else False
+        self.sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the options of the browser for pickling, e.g. to pass it to another process.
+
+        Connections, cached content and parsed documents are not included,
+        the browser is constructed anew from its options when unpickled.
+        """
+        return self._options
+
+    def __setstate__(self, options):
+        """Construct the browser from pickled options."""
+        self.__init__(*options)
+
+    def add_finished_jobs(self, job_ids):
+        """Record the jobs of 'job_ids' as done.
+
+        Only artifacts of finished jobs are kept without time to live and in
+        the job store, artifacts of other jobs can still change.
+        """
+        self.finished_jobs.update(str(job_id) for job_id in job_ids)
+
+    def _unfinished_job_artifact(self, url):
+        job_id = job_artifact(url)
+        return job_id is not None and job_id not in self.finished_jobs
+
+    def gc_job_store(self):
+        """Remove jobs not used within '--job-cache-max-age' days from the job store, meant to be called once per run."""
+        if self.job_store:
+            args = self._options[0]
+            self.job_store.gc((args.job_cache_max_age if hasattr(args, 'job_cache_max_age') else JOB_CACHE_MAX_AGE) * 24 * 3600)
+
+    def close(self):
+        """Close the stores and connections of the browser, writing outstanding changes of the stores, e.g. access times of 'SQLiteStore'."""
+        for store in (self.load_store, self.save_store, self.http_cache, self.job_store):
+            if store:
+                store.close()
+        with self._sessions_lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
+
+    @property
+    def deadline(self):
+        """Return the time after which no more requests are issued, None without deadline.
+
+        It is read from the options on each access so that it can be set for
+        each run, see '--deadline'.
+        """
+        args = self._options[0]
+        return args.deadline_at if hasattr(args, 'deadline_at') else None
+
+    def _remaining(self, url):
+        """Return the seconds left until the deadline, None without deadline, raising 'DeadlineExceededError' for 'url' if none is left."""
+        if self.deadline is None:
+            return None
+        remaining = self.deadline - time.time()
+        if remaining <= 0:
+            raise DeadlineExceededError("Request to %s not issued, deadline exceeded" % url)
+        return remaining
+
+    def _timeout(self, url):
+        """Return the connect and read timeout for a request to 'url', limited by the deadline."""
+        remaining = self._remaining(url)
+        return tuple(t if remaining is None else min(t, remaining) for t in self.timeout)
+
+    def session(self, url):
+        """Return the pooled 'requests.Session' for the host of an absolute URL.
+
+        One session is kept per scheme and host so that connections are reused
+        for all requests to the same host with up to 'max_connections'
+        connections in the pool.
+        """
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.netloc)
+        with self._sessions_lock:
+            if key not in self.sessions:
+                log.debug("Creating connection pool with %i connections for %s://%s" % (self.max_connections, key[0], key[1]))
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections)
+                session.mount('%s://' % parsed.scheme, adapter)
+                session.headers.update({
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Connection': 'keep-alive' if self.keep_alive else 'close',
+                })
+                self.sessions[key] = session
+            return self.sessions[key]
 
     def get_soup(self, url):
-        """Return content from URL as 'BeautifulSoup' output."""
+        """Return content from URL as 'BeautifulSoup' output.
+
+        With 'cache_parsed' the parsed document is also kept in the in-memory
+        cache.
+        """
         assert url, "url can not be None"
-        return BeautifulSoup(self.get_page(url), "html.parser")
+        soup = self.cache.get(('soup', url)) if self.cache_parsed else None
+        if soup is None:
+            page = self.get_page(url)
+            soup = BeautifulSoup(page, "html.parser")
+            if self.cache_parsed:
+                self.cache.put(('soup', url), soup, len(page) * SOUP_SIZE_FACTOR)
+        return soup
+
+    def expire(self):
+        """Drop content which can change from the in-memory cache, e.g. before retrieving a new report with the same browser.
+
+        Content of URLs without a time to live, see '--cache-ttl', e.g. of
+        finished jobs, is kept. Failed URLs and missing APIs are tried again.
+        """
+        for key in self.cache.keys():
+            url = key[1] if isinstance(key, tuple) else key
+            if url_ttl(url, self.ttls) is not None or self._unfinished_job_artifact(url):
+                self.cache.pop(key)
+        self.failed.clear()
+        self.missing_apis.clear()
+
+    def get_soup_many(self, urls):
+        """Return content from multiple URLs as list of 'BeautifulSoup' output, see 'get_many'."""
+        urls = list(urls)
+        if self.cache_parsed:
+            # retrieve missing pages concurrently, parsing is done one by one
+            self.get_many(url for url in urls if ('soup', url) not in self.cache)
+            return [self.get_soup(url) for url in urls]
+        return [BeautifulSoup(page, "html.parser") for page in self.get_many(urls)]
+
+    def get_many(self, urls, as_json=False, cache=True):
+        """Return content from multiple URLs as list in the same order as the URLs.
+
+        The pages are retrieved concurrently using up to 'max_connections'
+        worker threads each calling 'get_page' so the in-memory cache as well
+        as 'load' and 'save' are handled the same as for single pages. The
+        first error encountered is raised after all requests finished.
+        """
+        urls = list(urls)
+        unique_urls = list(OrderedDict.fromkeys(urls))
+        workers = min(self.max_connections, len(unique_urls))
+        if workers <= 1:
+            return [self.get_page(url, as_json=as_json, cache=cache) for url in urls]
+        log.debug("Retrieving %i URLs with %i concurrent connections" % (len(unique_urls), workers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            contents = dict(zip(unique_urls, executor.map(lambda url: self.get_page(url, as_json=as_json, cache=cache), unique_urls)))
+        return [contents[url] for url in urls]
 
     def get_json(self, url, cache=True):
         """Call get_page retrieving json API output."""
@@ -79,47 +263,120 @@ class Browser(object):
 
         If object parameter 'load' was specified, the URL content is loaded
         from a file.
+
+        JSON content is returned as a copy of the cached objects so that
+        callers can change it without affecting later readers.
         """
-        if url in self.cache and cache:
+        cached = self.cache.get(url) if cache else None
+        if cached is not None:
             log.info("Loading content instead of URL %s from in-memory cache" % url)
-            return json.loads(self.cache[url]) if as_json else self.cache[url]
-        filename = url_to_filename(url)
-        if self.load and cache:
-            log.info("Loading content instead of URL %s from filename %s" % (url, filename))
-            try:
-                raw = open(os.path.join(self.load_dir, filename)).read()
-            except IOError as e:
-                if e.errno == errno.ENOENT:
-                    msg = "Request to %s was not successful, file %s not found" % (url, filename)
-                    log.info(msg)
-                    # as 'load' simulates downloading we also have to simulate an appropriate error
-                    raise CacheNotFoundError(msg)
-                else:  # pragma: no cover
-                    raise
+            # content is kept decoded, only convert if requested differently
+            is_json, content = cached
+            if is_json == as_json:
+                return copy.deepcopy(content) if as_json else content
+            return json.loads(content) if as_json else json.dumps(content)
+        job_url = self._job_url(url) if cache else None
+        stored = self.job_store.get(job_url) if job_url else None
+        if stored is not None:
+            log.info("Loading content instead of URL %s from job cache" % url)
+            content = json.loads(stored) if as_json else stored
+        elif self.load and cache:
+            log.info("Loading content instead of URL %s from %s" % (url, self.load_dir))
+            raw = self.load_store.get(url)
+            if raw is None:
+                msg = "Request to %s was not successful, file %s not found" % (url, url_to_filename(url))
+                log.info(msg)
+                # as 'load' simulates downloading we also have to simulate an appropriate error
+                raise CacheNotFoundError(msg)
             content = json.loads(raw) if as_json else raw
+        elif self.http_cache and cache:
+            content = self._get_revalidated(url, as_json)
         else:  # pragma: no cover
-            absolute_url = url if not url.startswith('/') else urljoin(str(self.root_url), str(url))
-            for i in range(1, 7):
-                r = requests.get(absolute_url, auth=self.auth)
-                if r.status_code == 502:
-                    log.info("Request to %s failed with status code 502, retrying try %s" % (absolute_url, i))
-                    continue
-                if r.status_code != 200:
-                    msg = "Request to %s was not successful, status code: %s" % (absolute_url, r.status_code)
-                    log.info(msg)
-                    raise DownloadError(msg)
-                break
-            else:
-                msg = "Request to %s was not successful after multiple retries, giving up. Status code: %s" % (absolute_url, r.status_code)
-                log.warn(msg)
-                raise DownloadError(msg)
+            r = self._download(url)
             content = r.json() if as_json else r.content.decode('utf8')
         raw = json.dumps(content) if as_json else content
+        if job_url and stored is None:
+            self.job_store.put(job_url, raw)
         if self.save:
-            log.info("Saving content instead from URL %s from filename %s" % (url, filename))
-            codecs.open(os.path.join(self.save_dir, filename), 'w', 'utf-8').write(raw)
-        self.cache[url] = raw
-        return content
+            log.info("Saving content from URL %s to %s" % (url, self.save_dir))
+            self.save_store.put(url, raw)
+        self.cache.put(url, (as_json, content), len(raw))
+        return copy.deepcopy(content) if as_json else content
+
+    def _job_url(self, url):
+        """Return the absolute URL of 'url' if it is an immutable artifact of a job to be kept in the job cache, else None."""
+        if not self.job_store or job_artifact(url) not in self.finished_jobs:
+            return None
+        return self._absolute_url(url)
+
+    def _download(self, url, headers=None):
+        """Return response for URL retrying on temporary server errors.
+
+        With conditional request 'headers' also 'not modified' is accepted as
+        successful response. URLs which failed are not tried again by this
+        browser, see 'expire'.
+        """
+        absolute_url = self._absolute_url(url)
+        if absolute_url in self.failed:
+            log.debug("Not retrying failed request to %s" % absolute_url)
+            raise DownloadError(self.failed[absolute_url])
+        try:
+            return self._download_with_retries(absolute_url, headers)
+        except DownloadError as e:
+            self.failed[absolute_url] = str(e)
+            raise
+
+    def _download_with_retries(self, absolute_url, headers=None):
+        delay = RETRY_DELAY
+        for i in range(1, MAX_TRIES + 1):
+            try:
+                r = self.session(absolute_url).get(absolute_url, auth=self.auth, headers=headers, timeout=self._timeout(absolute_url))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                msg = "Request to %s failed: %s" % (absolute_url, e)
+                log.info(msg)
+                raise DownloadError(msg)
+            if r.status_code == 502:
+                log.info("Request to %s failed with status code 502, try %s" % (absolute_url, i))
+                if i < MAX_TRIES:
+                    remaining = self._remaining(absolute_url)
+                    if remaining is not None and remaining <= delay:
+                        raise DeadlineExceededError("Request to %s failed with status code 502, no time left to retry before deadline" % absolute_url)
+                    time.sleep(delay)
+                    delay *= 2
+                continue
+            if r.status_code != 200 and not (headers and r.status_code == 304):
+                msg = "Request to %s was not successful, status code: %s" % (absolute_url, r.status_code)
+                log.info(msg)
+                raise NotFoundError(msg) if r.status_code == 404 else DownloadError(msg)
+            break
+        else:
+            msg = "Request to %s was not successful after multiple retries, giving up. Status code: %s" % (absolute_url, r.status_code)
+            log.warn(msg)
+            raise DownloadError(msg)
+        return r
+
+    def _absolute_url(self, url):
+        return url if not url.startswith('/') else urljoin(str(self.root_url), str(url))
+
+    def _get_revalidated(self, url, as_json=False):
+        """Return content from HTTP cache, revalidated with a conditional request if expired.
+
+        Entries are keyed by absolute URL so that multiple hosts can share
+        the same cache directory.
+        """
+        absolute_url = self._absolute_url(url)
+        entry = self.http_cache.get(absolute_url)
+        # artifacts of jobs not known to be finished are always revalidated
+        if entry and self.http_cache.is_fresh(absolute_url, entry) and not self._unfinished_job_artifact(url):
+            log.info("Loading content instead of URL %s from HTTP cache" % url)
+        else:  # pragma: no cover
+            r = self._download(url, self.http_cache.validators(entry))
+            if r.status_code == 304:
+                log.info("Content of URL %s not modified, using HTTP cache" % url)
+                entry = self.http_cache.refresh(absolute_url, entry, r.headers)
+            else:
+                entry = self.http_cache.put(absolute_url, r.content.decode('utf8'), r.headers)
+        return json.loads(entry['content']) if as_json else entry['content']
 
     def json_rpc_get(self, url, method, params, cache=True):
         """Execute JSON RPC GET request."""
@@ -136,12 +393,10 @@ class Browser(object):
         if self.dry_run:
             log.warning("NOT sending '%s' request to '%s' with params %r" % (method, url, params))
             return {}
-        else:  # pragma: no cover
+        else:
             absolute_url = url if not url.startswith('/') else urljoin(str(self.root_url), str(url))
             data = json.dumps({'method': method, 'params': [params]})
-            r = requests.post(absolute_url, data=data, auth=self.auth, headers={'content-type': 'application/json'})
-            r.raise_for_status()
-            return r.json() if r.text else None
+            return self._send('POST', absolute_url, data=data, auth=self.auth, headers={'content-type': 'application/json'})
 
     def json_rest(self, url, method, data):
         """Execute JSON REST request.
@@ -151,12 +406,32 @@ class Browser(object):
         if self.dry_run and method.upper() != 'GET':
             log.warning("NOT sending '%s' request to '%s' with params %r" % (method, url, data))
             return {}
-        else:  # pragma: no cover
+        else:
             absolute_url = url if not url.startswith('/') else urljoin(str(self.root_url), str(url))
             data = json.dumps(data)
-            r = requests.request(method, absolute_url, data=data, headers={'X-Redmine-API-Key': self.auth[0], 'content-type': 'application/json'})
-            r.raise_for_status()
-            return r.json() if r.text else None
+            return self._send(method, absolute_url, data=data, headers={'X-Redmine-API-Key': self.auth[0], 'content-type': 'application/json'})
+
+    def _send(self, method, absolute_url, **kwargs):
+        """Return JSON response of a request which is not retried as it can change data, connection errors and timeouts raise 'DownloadError'."""
+        try:
+            r = self.session(absolute_url).request(method, absolute_url, timeout=self._timeout(absolute_url), **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            msg = "Request to %s failed: %s" % (absolute_url, e)
+            log.info(msg)
+            raise DownloadError(msg)
+        r.raise_for_status()
+        return r.json() if r.text else None
+
+
+def add_memory_cache_args(parser):
+    parser.add_argument('--memory-cache-size', type=int, default=MEMORY_CACHE_SIZE, metavar='BYTES',
+                        help="""Approximate memory budget of the in-memory
+                        cache of retrieved content, least recently used
+                        content is dropped when exceeded.""")
+    parser.add_argument('--cache-parsed', action='store_true',
+                        help="""Also keep parsed HTML documents in the
+                        in-memory cache to prevent parsing the same page
+                        multiple times at the cost of more memory.""")
 
 
 def add_load_save_args(parser):
@@ -176,3 +451,56 @@ def add_load_save_args(parser):
     parser.add_argument('--save-dir', default='.',
                         help="""The directory to write cache files to when
                         using '--save'.""")
+    parser.add_argument('--cache-backend', choices=sorted(STORE_BACKENDS.keys()), default='directory',
+                        help="""How content is stored in the directories of
+                        '--save-dir', '--load-dir' and '--cache-dir'. Either
+                        one file per URL or a single compressed SQLite
+                        database. Existing directories can be converted with
+                        'openqa-review-cache import'.""")
+    parser.add_argument('--cache-max-size', type=int, metavar='BYTES',
+                        help="""Maximum size of stored content, least recently
+                        used entries are evicted when exceeded.""")
+    parser.add_argument('--cache-dir',
+                        help="""Directory of a persistent HTTP cache. Cached
+                        content is used until it expires, see '--cache-ttl',
+                        after that it is revalidated with conditional requests
+                        so unchanged content is not transferred again.""")
+    parser.add_argument('--cache-ttl', action='append', type=ttl_spec, metavar='REGEX=SECONDS',
+                        help="""Time to live of content in the HTTP cache for
+                        URLs matching the regex, 'never' for content which
+                        never expires. Can be specified multiple times and
+                        takes precedence over the defaults, e.g. finished job
+                        pages never expire and job group overview pages expire
+                        after five minutes.""")
+
+
+def add_job_cache_args(parser):
+    parser.add_argument('--job-cache-dir',
+                        help="""Directory of a persistent cache of artifacts of
+                        finished jobs, e.g. job pages and module details,
+                        which never change. They are kept by job without
+                        expiring, e.g. for scenarios failing for multiple
+                        days.""")
+    parser.add_argument('--job-cache-max-age', type=float, default=JOB_CACHE_MAX_AGE, metavar='DAYS',
+                        help="""Remove jobs from the job cache when none of
+                        their artifacts was used within the last DAYS.""")
+
+
+def add_connection_args(parser):
+    parser.add_argument('--max-connections', type=int, default=MAX_CONNECTIONS,
+                        help="""Maximum number of concurrent requests to one
+                        host, e.g. when retrieving multiple pages at once.
+                        Can be overridden per host in the configuration
+                        file, see '--query-issue-status-help'. Also the
+                        number of connections kept open per host.""")
+    parser.add_argument('--connect-timeout', type=float, default=CONNECT_TIMEOUT, metavar='SECONDS',
+                        help="""Maximum time to wait for a connection to be
+                        established before a request is regarded as
+                        failed.""")
+    parser.add_argument('--read-timeout', type=float, default=READ_TIMEOUT, metavar='SECONDS',
+                        help="""Maximum time to wait for data from the server
+                        before a request is regarded as failed.""")
+    parser.add_argument('--no-keep-alive', action='store_false', default=True, dest='keep_alive',
+                        help="""Close connections after each request instead
+                        of reusing them for following requests to the same
+                        host.""")
@@ -0,0 +1,646 @@
+# Python 2 and 3: easiest option
+# see http://python-future.org/compatible_idioms.html
+from future.standard_library import install_aliases  # isort:skip to keep 'install_aliases()'
+install_aliases()
+from future.utils import iteritems
+
+import argparse
+import codecs
+import errno
+import hashlib
+import json
+import logging
+import os.path
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from urllib.parse import quote, unquote, urlparse
+
+logging.basicConfig()
+log = logging.getLogger(sys.argv[0] if __name__ == "__main__" else __name__)
+
+# time to live in seconds of cached responses by URL class, searched in order,
+# None means the content never expires, e.g. finished jobs do not change
+DEFAULT_TTLS = [
+    ('/tests/[0-9]+(/|$)', None),
+    ('/api/v1/jobs/[0-9]+/details', None),
+    ('/group_overview/', 5 * 60),
+    ('/tests/overview', 5 * 60),
+    ('', 10 * 60),
+]
+
+# artifacts of finished jobs which never change, the group is the job ID
+JOB_ARTIFACT_PATTERNS = [
+    '/tests/([0-9]+)$',
+    '/tests/([0-9]+)/file/',
+    '/api/v1/jobs/([0-9]+)/details$',
+]
+
+# number of reads of a 'SQLiteStore' after which their access times are written
+ACCESS_FLUSH_SIZE = 1000
+
+# maximum length of file names on common file systems
+MAX_FILENAME_LENGTH = 255
+
+
+def url_to_filename(url):
+    """
+    Convert URL to a valid, unambigous filename.
+
+    >>> url_to_filename('http://openqa.opensuse.org/tests/foo/3')
+    'http%3A::openqa.opensuse.org:tests:foo:3'
+    """
+    return quote(url).replace('/', ':')
+
+
+def filename_to_url(name):
+    """
+    Convert filename generated by 'url_to_filename' back to valid URL.
+
+    >>> str(filename_to_url('http%3A::openqa.opensuse.org:tests:foo:3'))
+    'http://openqa.opensuse.org/tests/foo/3'
+    """
+    return unquote(name.replace(':', '/'))
+
+
+def parse_ttls(specs):
+    """
+    Parse time to live specifications in the format '<regex>=<seconds|never>'.
+
+    >>> parse_ttls(['/tests/overview=60', 'jsonrpc=never'])
+    [('/tests/overview', 60), ('jsonrpc', None)]
+    """
+    ttls = []
+    for spec in specs or []:
+        pattern, _, ttl = spec.rpartition('=')
+        ttls.append((pattern, None if ttl == 'never' else int(ttl)))
+    return ttls
+
+
+def ttl_spec(value):
+    """Validate a time to live specification '<regex>=<seconds|never>', see '--cache-ttl' and 'parse_ttls'."""
+    pattern, separator, ttl = value.rpartition('=')
+    if not separator or not (ttl == 'never' or ttl.isdigit()):
+        raise argparse.ArgumentTypeError("invalid time to live '%s', expected REGEX=SECONDS with SECONDS a number or 'never'" % value)
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        raise argparse.ArgumentTypeError("invalid regex '%s' in time to live '%s': %s" % (pattern, value, e))
+    return value
+
+
+def url_ttl(url, ttls=None):
+    """Return time to live in seconds of 'url' by the first matching regex of 'ttls' or 'DEFAULT_TTLS', None if it never expires.
+
+    >>> url_ttl('/tests/1234'), url_ttl('/tests/overview?build=1'), url_ttl('/tests/1234', [('/tests/', 60)])
+    (None, 300, 60)
+    """
+    return next(ttl for pattern, ttl in (ttls or []) + DEFAULT_TTLS if re.search(pattern, url))
+
+
+def job_artifact(url):
+    """Return the ID of the job if 'url' is an immutable artifact of it, see 'JOB_ARTIFACT_PATTERNS', else None.
+
+    >>> job_artifact('https://openqa.opensuse.org/tests/1234/file/details-welcome.json'), job_artifact('/tests/overview?build=1')
+    ('1234', None)
+    """
+    for pattern in JOB_ARTIFACT_PATTERNS:
+        match = re.search(pattern, urlparse(url).path)
+        if match:
+            return match.group(1)
+    return None
+
+
+class LRUCache(object):
+
+    """In-memory cache evicting the least recently used entries above a memory budget.
+
+    The size of each entry is provided by the caller, e.g. the length of the
+    serialized content, so the budget is an approximation of the memory used.
+
+    >>> cache = LRUCache(max_size=10)
+    >>> cache.put('a', {'x': 1}, 6)
+    >>> cache.put('b', 'bbb', 3)
+    >>> cache.get('a')
+    {'x': 1}
+    >>> cache.put('c', 'cc', 2)
+    >>> 'b' in cache, cache.get('b')
+    (False, None)
+    >>> str(cache)
+    '2 entries, 8 of 10 bytes, 1 hits, 1 misses'
+    """
+
+    def __init__(self, max_size=None):
+        """Construct a cache limited to 'max_size' bytes, unlimited if None."""
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        """Return True if 'key' is cached without counting it as access."""
+        return key in self._entries
+
+    def __len__(self):
+        """Return number of cached entries."""
+        return len(self._entries)
+
+    def keys(self):
+        """Return the keys of all cached entries from least to most recently used."""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def get(self, key, default=None):
+        """Return cached value for 'key' marking it as most recently used, 'default' if not cached."""
+        with self._lock:
+            try:
+                value, size = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries[key] = (value, size)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, size):
+        """Cache 'value' for 'key' accounting for 'size' bytes, evicting old entries as necessary."""
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.max_size is not None and self.size > self.max_size and len(self._entries) > 1:
+                self.size -= self._entries.popitem(last=False)[1][1]
+
+    def pop(self, key):
+        """Remove 'key' from the cache if present."""
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __str__(self):
+        """Return statistics of the cache."""
+        return '%i entries, %i of %s bytes, %i hits, %i misses' % (
+            len(self._entries), self.size, self.max_size if self.max_size is not None else 'unlimited', self.hits, self.misses)
+
+
+class DirectoryStore(object):
+
+    """Store content in one file per URL within a directory, named by 'url_to_filename'.
+
+    URLs too long for a file name are stored under a shortened name made
+    unique by a hash and recorded in an index file within the directory.
+    The least recently accessed files are evicted when the store exceeds
+    'max_size' bytes. Access is determined by the access times of the files
+    which are only approximate on file systems mounted with 'relatime' and
+    the times of storing with 'noatime'.
+    """
+
+    index_filename = '.long_urls.json'
+
+    def __init__(self, path, max_size=None):
+        """Construct a store on the directory 'path'."""
+        self.path = path
+        self.max_size = max_size
+        # size of all files, only determined when needed for 'max_size'
+        self._size = None
+        # content is stored by multiple threads, e.g. by 'Browser.get_many'
+        self._lock = threading.Lock()
+
+    def _name(self, url):
+        name = url_to_filename(url)
+        if len(name) > MAX_FILENAME_LENGTH:
+            name = name[:200] + '.' + hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return name
+
+    def _filename(self, url):
+        return os.path.join(self.path, self._name(url))
+
+    def _index(self):
+        try:
+            with codecs.open(os.path.join(self.path, self.index_filename), 'r', 'utf-8') as f:
+                return json.load(f)
+        except IOError as e:
+            if e.errno != errno.ENOENT:  # pragma: no cover
+                raise
+            return {}
+
+    def get(self, url):
+        """Return content stored for 'url' or None if not found."""
+        try:
+            with codecs.open(self._filename(url), 'r', 'utf-8') as f:
+                return f.read()
+        except IOError as e:
+            if e.errno != errno.ENOENT:  # pragma: no cover
+                raise
+            return None
+
+    def put(self, url, content):
+        """Store 'content' for 'url'."""
+        name = self._name(url)
+        filename = os.path.join(self.path, name)
+        with self._lock:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+            if name != url_to_filename(url):
+                index = self._index()
+                index[name] = url
+                with codecs.open(os.path.join(self.path, self.index_filename), 'w', 'utf-8') as f:
+                    json.dump(index, f)
+            replaced = os.path.getsize(filename) if self._size is not None and os.path.exists(filename) else 0
+            with codecs.open(filename, 'w', 'utf-8') as f:
+                f.write(content)
+            if self.max_size is None:
+                return
+            if self._size is None:
+                self._size = sum(os.path.getsize(f) for f in self._files())
+            else:
+                self._size += os.path.getsize(filename) - replaced
+            exceeded = self._size > self.max_size
+        if exceeded:
+            self.evict(self.max_size)
+
+    def _files(self):
+        return [os.path.join(self.path, name) for name in sorted(os.listdir(self.path))
+                if os.path.isfile(os.path.join(self.path, name)) and name != self.index_filename]
+
+    def urls(self):
+        """Return all URLs with stored content."""
+        index = self._index()
+        return [index.get(os.path.basename(filename)) or filename_to_url(os.path.basename(filename)) for filename in self._files()]
+
+    def evict(self, max_size):
+        """Remove least recently accessed files until the size of the store is below 'max_size' bytes."""
+        with self._lock:
+            files = sorted(self._files(), key=os.path.getatime)
+            total = sum(os.path.getsize(f) for f in files)
+            for filename in files:
+                if total <= max_size:
+                    break
+                total -= os.path.getsize(filename)
+                os.remove(filename)
+            self._size = total
+
+    def gc(self, max_age=None):
+        """Remove files not accessed within 'max_age' seconds."""
+        if max_age is None:
+            return
+        with self._lock:
+            for filename in self._files():
+                if os.path.getatime(filename) < time.time() - max_age:
+                    os.remove(filename)
+            self._size = None
+
+    def close(self):
+        """Nothing to release for plain files."""
+        pass
+
+
+class SQLiteStore(object):
+
+    """Store compressed content of all URLs in a single indexed SQLite database file.
+
+    The time of last access is recorded for each entry so that the least
+    recently used entries can be evicted when the store exceeds 'max_size'
+    bytes of compressed content. Access times are kept in memory and only
+    written every 'ACCESS_FLUSH_SIZE' reads, together with other changes
+    or on 'close' so that reading does not need a transaction each.
+    """
+
+    def __init__(self, path, max_size=None):
+        """Construct a store on the database file 'path' which is created if missing."""
+        self.path = path
+        self.max_size = max_size
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._lock = threading.Lock()
+        self._accessed = {}
+        # size of all compressed content, only determined when needed for 'max_size' and updated on each change
+        self._size = None
+        # the store can be shared by multiple processes, see '--jobs'
+        self._db = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS entries (url TEXT PRIMARY KEY, content BLOB, size INTEGER, atime REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_atime ON entries (atime)")
+        self._db.commit()
+
+    def get(self, url):
+        """Return content stored for 'url' or None if not found."""
+        with self._lock:
+            row = self._db.execute("SELECT content FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self._accessed[url] = time.time()
+            if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+                self._write_accessed()
+                self._db.commit()
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def _write_accessed(self):
+        """Write the recorded access times, to be called with the lock held and committed by the caller."""
+        self._db.executemany("UPDATE entries SET atime = MAX(atime, ?) WHERE url = ?", ((atime, url) for url, atime in iteritems(self._accessed)))
+        self._accessed.clear()
+
+    def put(self, url, content):
+        """Store 'content' for 'url' evicting least recently used entries if 'max_size' is exceeded."""
+        blob = zlib.compress(content.encode('utf-8'))
+        with self._lock:
+            if self.max_size is not None:
+                if self._size is None:
+                    self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                replaced = self._db.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+                self._size += len(blob) - (replaced[0] if replaced else 0)
+            self._db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", (url, sqlite3.Binary(blob), len(blob), time.time()))
+            self._write_accessed()
+            self._db.commit()
+        if self.max_size is not None and self._size > self.max_size:
+            self.evict(self.max_size)
+
+    def urls(self):
+        """Return all URLs with stored content."""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT url FROM entries ORDER BY url")]
+
+    def size(self):
+        """Return the size of all compressed content in bytes."""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self, max_size):
+        """Remove least recently used entries until the size of the store is below 'max_size' bytes."""
+        with self._lock:
+            self._write_accessed()
+            self._db.commit()
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > max_size:
+                evicted = []
+                for url, size in self._db.execute("SELECT url, size FROM entries ORDER BY atime").fetchall():
+                    if total <= max_size:
+                        break
+                    evicted.append((url,))
+                    total -= size
+                log.debug("Evicting %i entries from %s" % (len(evicted), self.path))
+                self._db.executemany("DELETE FROM entries WHERE url = ?", evicted)
+                self._db.commit()
+            self._size = total
+
+    def gc(self, max_age=None):
+        """Remove entries not accessed within 'max_age' seconds and reclaim free space of the database file."""
+        with self._lock:
+            self._write_accessed()
+            if max_age is not None:
+                self._db.execute("DELETE FROM entries WHERE atime < ?", (time.time() - max_age,))
+                self._db.commit()
+            self._db.execute("VACUUM")
+            self._size = None
+
+    def close(self):
+        """Write recorded access times and close the database file."""
+        with self._lock:
+            self._write_accessed()
+            self._db.commit()
+            self._db.close()
+
+
+class IssueStore(object):
+
+    """Persistent store of issue tracker data of tickets in a SQLite database file.
+
+    Together with the data of each ticket the time of the last
+    synchronization with the issue tracker is recorded so that on later runs
+    only tickets changed since then need to be fetched again.
+    """
+
+    def __init__(self, path):
+        """Construct an issue store on the database file 'path' which is created if missing."""
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._db = sqlite3.connect(path)
+        self._db.execute("CREATE TABLE IF NOT EXISTS issues (bugref TEXT PRIMARY KEY, data TEXT, synced TEXT)")
+        self._db.commit()
+
+    def get(self, bugref):
+        """Return a tuple of the issue data of 'bugref' and the time of its last synchronization or None if not found."""
+        row = self._db.execute("SELECT data, synced FROM issues WHERE bugref = ?", (bugref,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def update(self, entries, synced):
+        """Store the issue data of all '(bugref, data)' tuples of 'entries' as synchronized with the issue tracker at 'synced'."""
+        self._db.executemany("INSERT OR REPLACE INTO issues VALUES (?, ?, ?)", ((bugref, json.dumps(data), synced) for bugref, data in entries))
+        self._db.commit()
+
+    def bugrefs(self):
+        """Return all stored bugrefs."""
+        return [row[0] for row in self._db.execute("SELECT bugref FROM issues ORDER BY bugref")]
+
+    def close(self):
+        """Close the database file."""
+        self._db.close()
+
+
+class JobStore(object):
+
+    """Persistent store of immutable artifacts of finished jobs in a SQLite database file.
+
+    Content is stored without time to live, grouped by job, only for URLs
+    matching 'JOB_ARTIFACT_PATTERNS'. Jobs are evicted as a whole when none
+    of their artifacts was accessed within a maximum age. Access times are
+    written deferred the same as for 'SQLiteStore'.
+    """
+
+    def __init__(self, path):
+        """Construct a job store on the database file 'path' which is created if missing."""
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._lock = threading.Lock()
+        self._accessed = {}
+        # the store can be shared by multiple processes, see '--jobs'
+        self._db = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS artifacts (job TEXT, url TEXT PRIMARY KEY, content BLOB, atime REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS artifacts_job ON artifacts (job)")
+        self._db.commit()
+
+    @staticmethod
+    def _job(url):
+        job_id = job_artifact(url)
+        return urlparse(url).netloc + '/' + job_id if job_id else None
+
+    def get(self, url):
+        """Return content stored for the absolute 'url' or None if not found."""
+        with self._lock:
+            row = self._db.execute("SELECT content FROM artifacts WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self._accessed[url] = time.time()
+            if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+                self._write_accessed()
+                self._db.commit()
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def _write_accessed(self):
+        """Write the recorded access times, to be called with the lock held and committed by the caller."""
+        self._db.executemany("UPDATE artifacts SET atime = MAX(atime, ?) WHERE url = ?", ((atime, url) for url, atime in iteritems(self._accessed)))
+        self._accessed.clear()
+
+    def put(self, url, content):
+        """Store 'content' for the absolute 'url', ignored unless it is an artifact of a job."""
+        job = self._job(url)
+        if not job:
+            return
+        blob = zlib.compress(content.encode('utf-8'))
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?)", (job, url, sqlite3.Binary(blob), time.time()))
+            self._write_accessed()
+            self._db.commit()
+
+    def jobs(self):
+        """Return all jobs with stored artifacts as '<host>/<job ID>'."""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT DISTINCT job FROM artifacts ORDER BY job")]
+
+    def gc(self, max_age, now=None):
+        """Remove all artifacts of jobs of which no artifact was accessed within 'max_age' seconds."""
+        with self._lock:
+            self._write_accessed()
+            self._db.execute("DELETE FROM artifacts WHERE job IN (SELECT job FROM artifacts GROUP BY job HAVING MAX(atime) < ?)",
+                             ((now or time.time()) - max_age,))
+            self._db.commit()
+
+    def close(self):
+        """Write recorded access times and close the database file."""
+        with self._lock:
+            self._write_accessed()
+            self._db.commit()
+            self._db.close()
+
+
+# file name of the database within the cache directory for the 'sqlite' backend
+SQLITE_FILENAME = 'openqa_review_cache.sqlite'
+
+# file name of the database of 'JobStore' within the job cache directory
+JOB_STORE_FILENAME = 'openqa_review_jobs.sqlite'
+
+STORE_BACKENDS = {
+    'directory': lambda path, max_size=None: DirectoryStore(path, max_size),
+    'sqlite': lambda path, max_size=None: SQLiteStore(os.path.join(path, SQLITE_FILENAME), max_size),
+}
+
+
+def open_store(path, backend='directory', max_size=None):
+    """Return a store of type 'backend' within the directory 'path'."""
+    return STORE_BACKENDS[backend](path, max_size)
+
+
+def import_directory(store, path):
+    """Import all files saved with '--save' in directory 'path' into 'store', return the number of imported entries."""
+    source = DirectoryStore(path)
+    urls = source.urls()
+    for url in urls:
+        store.put(url, source.get(url))
+    return len(urls)
+
+
+class HTTPCache(object):
+
+    """Persistent cache of HTTP responses with validators and a time to live per URL class.
+
+    Each entry is stored as JSON in a store, see 'open_store', and carries
+    the content together with the 'ETag' and 'Last-Modified' headers of the
+    response for later revalidation.
+    """
+
+    def __init__(self, store, ttls=None):
+        """Construct a cache, 'ttls' is a list of (regex, seconds) searched before 'DEFAULT_TTLS'."""
+        self.store = store
+        self.ttls = ttls or []
+
+    def ttl(self, url):
+        """Return time to live in seconds for the URL class of 'url', None if it never expires."""
+        return url_ttl(url, self.ttls)
+
+    def get(self, url):
+        """Return the cache entry for 'url' as dict or None if not cached."""
+        entry = self.store.get(url)
+        return json.loads(entry) if entry is not None else None
+
+    def is_fresh(self, url, entry, now=None):
+        """Return True if 'entry' for 'url' can be used without revalidation."""
+        ttl = self.ttl(url)
+        return ttl is None or (now or time.time()) - entry['fetched'] < ttl
+
+    def validators(self, entry):
+        """Return headers for a conditional request revalidating 'entry'."""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, content, headers=None, now=None):
+        """Store 'content' retrieved from 'url' with the validators found in the response 'headers'."""
+        headers = headers or {}
+        entry = {
+            'url': url,
+            'fetched': now or time.time(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'content': content,
+        }
+        self.store.put(url, json.dumps(entry))
+        return entry
+
+    def refresh(self, url, entry, headers=None, now=None):
+        """Mark 'entry' as fresh again after the server confirmed it as unchanged."""
+        headers = headers or {}
+        return self.put(url, entry['content'], {
+            'ETag': headers.get('ETag', entry.get('etag')),
+            'Last-Modified': headers.get('Last-Modified', entry.get('last_modified')),
+        }, now)
+
+    def close(self):
+        """Close the underlying store."""
+        self.store.close()
+
+
+def main():  # pragma: no cover, only interactive
+    parser = argparse.ArgumentParser(description="Maintain cache stores of openqa-review")
+    parser.add_argument('--backend', choices=sorted(STORE_BACKENDS.keys()), default='sqlite',
+                        help="Backend of the cache store within CACHE_DIR")
+    subparsers = parser.add_subparsers(dest='command')
+    import_parser = subparsers.add_parser('import', help="Import files saved with '--save' into a cache store")
+    import_parser.add_argument('save_dir', help="Directory with files saved with '--save'")
+    import_parser.add_argument('cache_dir', help="Directory of the cache store to import into")
+    gc_parser = subparsers.add_parser('gc', help="Remove old entries from a cache store and reclaim space")
+    gc_parser.add_argument('cache_dir', help="Directory of the cache store")
+    gc_parser.add_argument('--max-age', type=float, help="Remove entries not accessed within the last MAX_AGE days")
+    gc_parser.add_argument('--max-size', type=int, help="Remove least recently used entries until the store is below MAX_SIZE bytes")
+    args = parser.parse_args()
+    store = open_store(args.cache_dir, args.backend)
+    if args.command == 'import':
+        print("Imported %i entries" % import_directory(store, args.save_dir))
+    elif args.command == 'gc':
+        if args.max_size is not None:
+            store.evict(args.max_size)
+        store.gc(args.max_age * 24 * 3600 if args.max_age is not None else None)
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
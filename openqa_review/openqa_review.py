@@ -58,6 +58,8 @@ authentication and only reads the webpage. No harm should be done :-)
  - tox.ini: Local tests, doctests, check with flake8
  - Generate version based on git describe
  - Add support to parse all job groups
+ - Retrieve multiple pages concurrently, configurable with '--max-connections'
+ - Extract test results from overview pages in one pass, using lxml if available
 
 
 # How to use
@@ -95,24 +97,33 @@ install_aliases()
 from future.utils import iteritems
 
 import argparse
+import copy
 import datetime
+import hashlib
+import json
 import logging
+import multiprocessing.util
 import os.path
+import pickle
 import re
 import sys
-import json
+import threading
+import time
 from collections import defaultdict, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from configparser import ConfigParser, NoSectionError, NoOptionError  # isort:skip can not make isort happy here
 from requests.exceptions import HTTPError
 from string import Template
-from urllib.parse import quote, unquote, urljoin, urlencode, splitquery, parse_qs
+from urllib.parse import quote, unquote, urljoin, urlencode, urlparse, splitquery, parse_qs
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from sortedcontainers import SortedDict
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from openqa_review.browser import Browser, DownloadError, add_load_save_args  # isort:skip
+from openqa_review.browser import (Browser, DownloadError, NotFoundError, add_connection_args, add_job_cache_args, add_load_save_args,  # isort:skip
+                                   add_memory_cache_args)
+from openqa_review.cache import IssueStore, open_store, url_ttl  # isort:skip
 
 
 # treat humanfriendly as optional dependency
@@ -125,10 +136,39 @@ except ImportError:  # pragma: no cover
     def pluralize(_1, _2, plural):
         return plural
 
+# treat lxml as optional dependency for faster parsing of overview pages
+lxml_available = False
+try:
+    import lxml.html
+    lxml_available = True
+except ImportError:  # pragma: no cover
+    pass
+
+# treat markdown as optional dependency for html output
+markdown_available = False
+try:
+    import markdown
+    markdown_available = True
+except ImportError:  # pragma: no cover
+    pass
+
+# the initializer of process pools is only available since python 3.7
+pool_initializer_available = sys.version_info >= (3, 7)
+
 
 # minimum number of days an issue is unchanged before putting a reminder comment
 MIN_DAYS_UNCHANGED = 14
 
+# maximum number of bugs queried with one bugzilla request and the fields needed
+BUGZILLA_BATCH_SIZE = 100
+BUGZILLA_FIELDS = ['id', 'status', 'resolution', 'assigned_to', 'summary', 'priority', 'last_change_time']
+
+# maximum number of issues redmine returns with one request
+REDMINE_BATCH_SIZE = 100
+
+# details of a job including the results of its modules, not provided by older openQA versions
+JOB_DETAILS_API = '/api/v1/jobs/%s/details'
+
 logging.basicConfig()
 log = logging.getLogger(sys.argv[0] if __name__ == "__main__" else __name__)
 logging.captureWarnings(True)  # see https://urllib3.readthedocs.org/en/latest/security.html#disabling-warnings
@@ -162,6 +202,12 @@ installation-bootloader = Bootloader
 system = redmine
 #api_key = 0123456789ABCDEF
 report_url = https://progress.opensuse.org/projects/openqatests/issues/new
+
+# optional limits of concurrent connections per host overriding
+# '--max-connections'
+#[max_connections]
+#openqa.suse.de = 8
+#apibugzilla.suse.com = 2
 """
 
 
@@ -250,40 +296,255 @@ def get_test_details(entry):
             }
 
 
+def _bugref(title, href):
+    # work around openQA providing incorrect URLs (e.g. following whitespace)
+    return {'bugref': re.search('\S+#([0-9]+)', title).group(),
+            'bugref_href': href.strip()
+            }
+
+
 def get_test_bugref(entry):
     bugref = entry.find(id=re.compile('^bug-'))
     if not bugref:
         return {}
-    # work around openQA providing incorrect URLs (e.g. following whitespace)
-    return {'bugref': re.search('\S+#([0-9]+)', bugref.i['title']).group(),
-            'bugref_href': bugref.a['href'].strip()
-            }
+    return _bugref(bugref.i['title'], bugref.a['href'])
+
+
+def get_test_result(entry):
+    """Return result record of a test status html-td entry."""
+    result = {'id': entry['id'], 'status': status(entry)}
+    result.update(get_test_details(entry))
+    result.update(get_test_bugref(entry))
+    return result
+
+
+class OverviewPage(object):
+
+    """Test results of one build extracted from a '/tests/overview' page.
+
+    Result records of all test status cells are indexed by their id and by
+    architecture so that the results of each architecture can be looked up
+    without searching the whole document again.
+    """
+
+    def __init__(self, summary, archs, results, badges_total):
+        """Construct an overview page object from extracted content."""
+        self.summary = summary
+        self.archs = archs
+        self.results = results
+        self.badges_total = badges_total
+        self._arch_results = defaultdict(dict)
+        if archs:
+            # cell ids are in the format 'res_<flavor>_<arch>_<test>', longer names first for architectures like 'x86_64'
+            arch_re = re.compile('_(%s)_' % '|'.join(re.escape(arch) for arch in sorted(archs, key=len, reverse=True)))
+            for k, v in iteritems(results):
+                match = arch_re.search(k)
+                if match:
+                    self._arch_results[match.group(1)][k] = v
+
+    def arch_results(self, arch):
+        """Return dict of result records of all cells for 'arch'."""
+        return dict(self._arch_results.get(arch, {}))
+
+    def to_json(self):
+        """Return the extracted content serialized as JSON."""
+        return json.dumps({'summary': self.summary, 'archs': sorted(self.archs), 'results': self.results, 'badges_total': self.badges_total})
+
+    @classmethod
+    def from_json(cls, content):
+        """Construct an overview page object from content serialized by 'to_json'."""
+        d = json.loads(content)
+        return cls(d['summary'], set(d['archs']), d['results'], d['badges_total'])
+
+
+# only the build summary, architecture headers and test status cells are of interest
+overview_strainer = SoupStrainer(id=re.compile('^(summary$|flavor_|res_)'))
+
+
+def _parse_overview_soup(page):
+    details = BeautifulSoup(page, 'html.parser', parse_only=overview_strainer)
+    return OverviewPage(
+        summary=parse_summary(details) if details.find(id='summary') else {},
+        archs=set(arch.text for arch in details.find_all('th', id=re.compile('flavor_'))),
+        results={entry['id']: get_test_result(entry) for entry in details.find_all('td', id=True)},
+        badges_total=sum(int(badge.text) for badge in details.find_all(class_='badge')))
+
+
+def _xpath_class(name):
+    return 'contains(concat(" ", normalize-space(@class), " "), " %s ")' % name
+
+
+def _lxml_previous_text(element):
+    previous = element.getprevious()
+    return (previous.tail if previous is not None else element.getparent().text) or ''
+
+
+def _lxml_test_result(entry):
+    failedmodules = entry.xpath('.//*[%s]' % _xpath_class('failedmodule'))
+    result = {'id': entry.get('id'),
+              'status': [s for s in entry.xpath('.//i')[0].get('class').split() if re.search('(state|result)_', s)][0],
+              'href': entry.xpath('.//a')[0].get('href'),
+              'failedmodules': [{'href': m.xpath('.//a')[0].get('href'), 'name': m.text_content().strip(), 'needles': get_failed_needles(m.attrib)}
+                                for m in failedmodules]
+              }
+    bugref = entry.xpath('.//*[starts-with(@id, "bug-")]')
+    if bugref:
+        result.update(_bugref(bugref[0].xpath('.//i')[0].get('title'), bugref[0].xpath('.//a')[0].get('href')))
+    return result
+
+
+def _parse_overview_lxml(page):
+    document = lxml.html.fromstring(page)
+    badges = document.xpath('//*[%s]' % _xpath_class('badge'))
+    return OverviewPage(
+        summary={_lxml_previous_text(i).strip().rstrip(':').lower(): int(i.text_content())
+                 for i in document.xpath('//*[@id="summary"]//*[%s]' % _xpath_class('badge'))},
+        archs=set(arch.text_content() for arch in document.xpath('//th[starts-with(@id, "flavor_")]')),
+        results={entry.get('id'): _lxml_test_result(entry) for entry in document.xpath('//td[starts-with(@id, "res_")]')},
+        badges_total=sum(int(badge.text_content()) for badge in badges))
+
+
+def parse_overview(page, use_lxml=None):
+    """Extract test results from the content of a '/tests/overview' page, see 'OverviewPage'.
+
+    Uses lxml if available, the pure-python html parser otherwise.
+    """
+    if use_lxml is None:
+        use_lxml = lxml_available
+    return _parse_overview_lxml(page) if use_lxml else _parse_overview_soup(page)
+
+
+# version of the records extracted by 'parse_overview', to be increased when they change to invalidate cached results
+OVERVIEW_RESULTS_VERSION = 1
+
+
+def extract_overview(page, results_cache=None):
+    """Return 'parse_overview' results of an overview page reusing results extracted from identical content before.
+
+    'results_cache' is a store as returned by 'openqa_review.cache.open_store'
+    in which results are kept by a hash of the page content.
+    """
+    if results_cache is None:
+        return parse_overview(page)
+    key = 'overview-results:%i:%s' % (OVERVIEW_RESULTS_VERSION, hashlib.sha1(page.encode('utf-8')).hexdigest())
+    cached = results_cache.get(key)
+    if cached is not None:
+        log.debug("Reusing results of identical overview page %s" % key)
+        return OverviewPage.from_json(cached)
+    overview = parse_overview(page)
+    results_cache.put(key, overview.to_json())
+    return overview
+
+
+# labels of the build summary badges on overview pages by job result
+summary_labels = {
+    'passed': 'passed',
+    'softfailed': 'soft failure',
+    'failed': 'failed',
+    'incomplete': 'incomplete',
+}
+
+
+def get_api_bugref(comments):
+    """Return bugref of the most recent job comment referencing any bug."""
+    for comment in reversed(comments):
+        bugrefs = comment.get('bugrefs') or re.findall('[a-z]{3}#[0-9]+', comment['text'])
+        if bugrefs:
+            tracker, bug_id = bugrefs[0].split('#')
+            return {'bugref': bugrefs[0], 'bugref_href': issue_tracker[tracker](bug_id) if tracker in issue_tracker else ''}
+    return {}
+
+
+def get_api_failed_module(job_id, module):
+    """Return failed module record of a module of the job details API, linking the first failed step and listing its candidate needles."""
+    steps = module.get('details', [])
+    num, step = next(((i + 1, step) for i, step in enumerate(steps) if step.get('result') == 'fail'), (1, {}))
+    return {'href': '/tests/%s/modules/%s/steps/%s' % (job_id, module['name'], step.get('num', num)),
+            'name': module['name'],
+            'needles': [needle['name'] for needle in step.get('needles', [])]}
+
+
+def get_api_test_result(job, test, comments=None, details=None):
+    """Return result record of a job from the openQA API, the same as 'get_test_result' for overview pages.
+
+    The failing steps and needles of failed modules are taken from the job
+    'details' if provided, see '/api/v1/jobs/<id>/details'.
+    """
+    settings = job['settings']
+    if details:
+        failedmodules = [get_api_failed_module(job['id'], m) for m in details['job'].get('testresults', []) if m.get('result') == 'failed']
+    else:
+        failedmodules = [{'href': '/tests/%s/modules/%s/steps/1' % (job['id'], m['name']), 'name': m['name'], 'needles': []}
+                         for m in job.get('modules', []) if m.get('result') == 'failed']
+    result = {'id': 'res_%s_%s_%s' % (settings['FLAVOR'], settings['ARCH'], test),
+              'status': 'result_%s' % job['result'] if job['state'] == 'done' else 'state_%s' % job['state'],
+              'href': '/tests/%s' % job['id'],
+              'failedmodules': failedmodules,
+              }
+    result.update(get_api_bugref(comments or []))
+    return result
+
+
+def api_overview(browser, overview_url, bugrefs=False):
+    """Return 'OverviewPage' of the build of 'overview_url' built from the openQA jobs API instead of the page.
+
+    Comments are only retrieved for jobs which did not pass if 'bugrefs' is set.
+    The details of finished jobs with failed modules are retrieved for their
+    failing steps and needles.
+    """
+    jobs = browser.get_json('/api/v1/jobs?%s&latest=1' % splitquery(overview_url)[1])['jobs']
+    # like on the overview page the machine is only part of the test name if it is not the most common one of the architecture
+    machines = defaultdict(lambda: defaultdict(int))
+    for job in jobs:
+        machines[job['settings']['ARCH']][job['settings'].get('MACHINE')] += 1
+    preferred_machine = {arch: sorted(counts.items(), key=lambda i: (-i[1], str(i[0])))[0][0] for arch, counts in iteritems(machines)}
+
+    def test_name(job):
+        settings = job['settings']
+        machine = settings.get('MACHINE')
+        return settings['TEST'] + ('@%s' % machine if machine != preferred_machine[settings['ARCH']] else '')
+    commented_jobs = [job['id'] for job in jobs if bugrefs and job.get('result') != 'passed']
+    comments = dict(zip(commented_jobs, browser.get_many(['/api/v1/jobs/%s/comments' % i for i in commented_jobs], as_json=True)))
+    browser.add_finished_jobs(job['id'] for job in jobs if job['state'] == 'done')
+    # details of unfinished jobs can still change, e.g. with '--running-threshold', only their failed modules are listed
+    failed_jobs = [job['id'] for job in jobs if job['state'] == 'done' and any(m.get('result') == 'failed' for m in job.get('modules', []))]
+    details = dict(zip(failed_jobs, browser.get_many([JOB_DETAILS_API % i for i in failed_jobs], as_json=True)))
+    summary = defaultdict(int)
+    for job in jobs:
+        summary[summary_labels.get(job['result'], 'none') if job['state'] == 'done' else job['state']] += 1
+    return OverviewPage(
+        summary=dict(summary),
+        archs=set(machines.keys()),
+        results={r['id']: r for r in (get_api_test_result(job, test_name(job), comments.get(job['id']), details.get(job['id'])) for job in jobs)},
+        badges_total=len(jobs))
+
+
+def finished_job_ids(details):
+    """Return the IDs of the jobs of the 'OverviewPage' 'details' which are done, see 'Browser.add_finished_jobs'."""
+    return [result['href'].rsplit('/', 1)[-1] for result in details.results.values() if result['status'].startswith('result_')]
 
 
 def get_state(cur, prev_dict):
-    """Return change_state for 'previous' and 'current' test status html-td entries."""
+    """Return change_state for 'previous' and 'current' test result records."""
     # TODO instead of just comparing the overall state we could check if
     # failing needles differ
     try:
         prev = prev_dict[cur['id']]
-        state_dict = {'state': change_state[(status(prev), status(cur))]}
+        state_dict = {'state': change_state[(prev['status'], cur['status'])]}
         # add more details, could be skipped if we don't have details
-        state_dict.update({'prev': {'href': prev.find('a')['href']}})
+        state_dict.update({'prev': {'href': prev['href']}})
     except KeyError:
         # if there is no previous or it was never completed we assume passed to mark new failing test as 'NEW_ISSUE'
-        state_dict = {'state': change_state.get(('result_passed', status(cur)), 'INCOMPLETE')}
-    state_dict.update(get_test_details(cur))
-    state_dict.update(get_test_bugref(cur))
+        state_dict = {'state': change_state.get(('result_passed', cur['status']), 'INCOMPLETE')}
+    state_dict.update({k: v for k, v in iteritems(cur) if k not in ('id', 'status')})
     return cur['id'], state_dict
 
 
 def get_arch_state_results(arch, current_details, previous_details, output_state_results=False):
-    result_re = re.compile(arch + '_')
-    test_results = current_details.find_all('td', id=result_re)
-    test_results_previous = previous_details.find_all('td', id=result_re)
+    """Return interesting states of 'arch' comparing 'OverviewPage' objects of the current and previous build."""
     # find differences from previous to current (result_X)
-    test_results_dict = {i['id']: i for i in test_results}
-    test_results_previous_dict = {i['id']: i for i in test_results_previous if i['id'] in test_results_dict.keys()}
+    test_results_dict = current_details.arch_results(arch)
+    test_results_previous_dict = {k: v for k, v in iteritems(previous_details.arch_results(arch)) if k in test_results_dict}
     states = SortedDict(get_state(v, test_results_previous_dict) for k, v in iteritems(test_results_dict))
     # intermediate step:
     # - print report of differences
@@ -299,18 +560,35 @@ def absolute_url(root, v):
     return urljoin(root, str(v['href']))
 
 
+def max_connections(args, url):
+    """Return the limit of concurrent connections for the host of 'url', None for the default."""
+    default = args.max_connections if hasattr(args, 'max_connections') else None
+    if not config:
+        return default
+    try:
+        return config.getint('max_connections', urlparse(url).netloc)
+    except (NoSectionError, NoOptionError):
+        return default
+
+
 def progress_browser_factory(args):
     return Browser(args, '', auth=(
         config.get('test_issues', 'api_key'),
         "foobar",
-    ))
+    ), max_connections=max_connections(args, issue_tracker['poo']('')))
 
 
 def bugzilla_browser_factory(args):
-    return Browser(args, config.get('product_issues', 'base_url'), auth=(
+    base_url = config.get('product_issues', 'base_url')
+    return Browser(args, base_url, auth=(
         config.get('product_issues', 'username'),
         config.get('product_issues', 'password'),
-    ))
+    ), max_connections=max_connections(args, base_url))
+
+
+def issue_executor_factory(progress_browser, bugzilla_browser):
+    """Return executor to query the issue trackers with as many threads as both browsers have connections, see 'query_issues'."""
+    return ThreadPoolExecutor(max_workers=progress_browser.max_connections + bugzilla_browser.max_connections)
 
 
 def issue_listing(header, issues, show_empty=True):
@@ -408,6 +686,16 @@ def find_last_reviewed_build(comments):
     return last_reviewed
 
 
+def get_group_result(job_group):
+    """Return the results of a job group by build."""
+    try:
+        results_list = job_group['build_results']
+        return {i['build']: i for i in results_list}
+    except KeyError:
+        log.debug("Reverting to old openQA behaviour before openQA#9b50b22")
+        return job_group['result']
+
+
 def get_build_urls_to_compare(browser, job_group_url, builds='', against_reviewed=None, running_threshold=0):
     """
     From the job group page get URLs for the builds to compare.
@@ -421,23 +709,15 @@ def get_build_urls_to_compare(browser, job_group_url, builds='', against_reviewe
     """
     job_group = browser.get_json('%s.json' % job_group_url)
 
-    def get_group_result():
-        try:
-            results_list = job_group['build_results']
-            return {i['build']: i for i in results_list}
-        except KeyError:
-            log.debug("Reverting to old openQA behaviour before openQA#9b50b22")
-            return job_group['result']
-
     def build_url(build):
-        r = get_group_result()
+        r = get_group_result(job_group)
         b = r.get(build, next(iter(r.values())))
         build = b.get('build', build)
         # openQA introduced multi-distri support for the job groups with openQA#037ffd33
         distri_str = 'distri=%s' % b['distri'] if 'distri' in b.keys() else 'distri=' + '&distri='.join(sorted(b['distris'].keys()))
         return '/tests/overview?%s&version=%s&build=%s&groupid=%i' % (distri_str, b['version'], quote(build), job_group['group']['id'])
 
-    finished_builds = find_builds(get_group_result(), running_threshold)
+    finished_builds = find_builds(get_group_result(job_group), running_threshold)
     # find last finished and previous one
     builds_to_compare = sorted(finished_builds, reverse=True)[0:2]
 
@@ -478,13 +758,61 @@ def get_failed_module_details_for_report(f):
     return name, url, details
 
 
-def issue_report_link(root_url, f, test_browser=None):
-    """Generate a bug reporting link for the current issue."""
+def report_link_config(root_url):
+    """Return the configuration for issue report links of 'root_url' with the component mapping regexes compiled.
+
+    The result can be passed to 'issue_report_link' to prevent reading the
+    configuration again for each link.
+    """
+    component_config_section = 'product_issues:%s:component_mapping' % root_url.rstrip('/')
+    try:
+        components = [(re.compile(k), v) for k, v in config.items(component_config_section)]
+    except NoSectionError as e:  # pragma: no cover
+        log.info("No component mapping found in the config: %s" % e)
+        components = []
+    return {
+        'product_section': 'product_issues:%s:product_mapping' % root_url.rstrip('/'),
+        'components': components,
+        'product_report_url': urljoin(str(config.get('product_issues', 'report_url')), 'enter_bug.cgi'),
+        'test_report_url': config.get('test_issues', 'report_url'),
+    }
+
+
+def parsed_page(browser, url, parsed=None):
+    """Return the page of 'url' parsed by 'browser', kept in the dict 'parsed' if given so that multiple consumers parse each page only once."""
+    if parsed is None:
+        return browser.get_soup(url)
+    if url not in parsed:
+        parsed[url] = browser.get_soup(url)
+    return parsed[url]
+
+
+def add_report_links(ies, root_url, test_browser, parsed=None):
+    """Generate the issue report links of all failures of the issue entries 'ies' ahead of rendering them.
+
+    The job pages of all failures are retrieved concurrently, the
+    configuration is read once and each job is only processed once. Pages
+    already parsed can be passed as 'parsed', see 'parsed_page'.
+    """
+    failures = [f for ie in ies if ie.test_browser for f in ie.failures if 'report_link' not in f]
+    if not failures:
+        return
+    test_browser.get_many(OrderedDict.fromkeys(f['href'] for f in failures))
+    link_config = report_link_config(root_url)
+    links = {}
+    for f in failures:
+        if f['href'] not in links:
+            links[f['href']] = issue_report_link(root_url, f, test_browser, link_config, parsed)
+        f['report_link'] = links[f['href']]
+
+
+def issue_report_link(root_url, f, test_browser=None, link_config=None, parsed=None):
+    """Generate a bug reporting link for the current issue, see 'report_link_config' for 'link_config' and 'parsed_page' for 'parsed'."""
     # always select the first failed module.
     # It might not be the fatal one but better be safe and assume the first
     # failed module introduces a problem in the whole job
 
-    test_details_page = test_browser.get_soup(f['href'])
+    test_details_page = parsed_page(test_browser, f['href'], parsed)
     current_build_overview = splitquery(test_details_page.find(id='current-build-overview').a['href'])
     overview_params = parse_qs(current_build_overview[-1])
     group = overview_params['groupid'][0]
@@ -529,7 +857,7 @@ Last good: %s (or more recent)
 Always latest result in this scenario: [latest](%s)
 """ % (scenario, urljoin(root_url, str(url)), details, first_known_bad, last_good, latest_link)
 
-    config_section = 'product_issues:%s:product_mapping' % root_url.rstrip('/')
+    link_config = link_config or report_link_config(root_url)
     # the test module name itself is often not specific enough, that is why we step upwards from the current module until we find the module folder and
     # concatenate the complete module name in format <folder>-<module> and search for that in the config for potential mappings
     first_step_url = urljoin(str(url), '1/src')
@@ -540,15 +868,12 @@ Always latest result in this scenario: [latest](%s)
         module_folder = ''
         log.warn("Could not find module folder on test details page searching for parents of %s" % first_step_url)
     complete_module = module_folder + '-' + module
-    component_config_section = 'product_issues:%s:component_mapping' % root_url.rstrip('/')
-    try:
-        components_config_dict = dict(config.items(component_config_section))
-        component = [v for k, v in iteritems(components_config_dict) if re.match(k, complete_module)][0]
-    except (NoSectionError, IndexError) as e:  # pragma: no cover
-        log.info("No matching component could be found for the module_folder '%s' and module name '%s' in the config section '%s'" % (module_folder, module, e))
+    component = next((v for k, v in link_config['components'] if k.match(complete_module)), None)
+    if component is None:  # pragma: no cover
+        log.info("No matching component could be found for the module_folder '%s' and module name '%s' in the config" % (module_folder, module))
         component = ''
     try:
-        product = config.get(config_section, group)
+        product = config.get(link_config['product_section'], group)
     except NoOptionError as e:  # pragma: no cover
         log.info("%s. Reporting link for product will not work." % e)
         product = ''
@@ -559,21 +884,79 @@ Always latest result in this scenario: [latest](%s)
         ('bug_file_loc', urljoin(root_url, str(url))),
         ('comment', description)
     ])
-    product_bug = urljoin(str(config.get('product_issues', 'report_url')), 'enter_bug.cgi') + '?' + urlencode(product_entries)
+    product_bug = link_config['product_report_url'] + '?' + urlencode(product_entries)
     test_entries = OrderedDict([
         ('issue[subject]', '[Build %s] test %sfails' % (build, module + ' ' if module else '')),
         ('issue[description]', description)
     ])
-    test_issue = config.get('test_issues', 'report_url') + '?' + urlencode(test_entries)
+    test_issue = link_config['test_report_url'] + '?' + urlencode(test_entries)
     return ': report [product bug](%s) / [openQA issue](%s)' % (product_bug, test_issue)
 
 
+# marks threads querying issue trackers which must not wait for the queries of issues to finish
+_querying = threading.local()
+
+
+def _in_query(function, *args):
+    _querying.active = True
+    try:
+        return function(*args)
+    finally:
+        # the worker thread is reused for other tasks
+        _querying.active = False
+
+
+class _Resolved(object):
+
+    """Attribute of an 'Issue' only known after the issue tracker has been queried.
+
+    Reading the attribute blocks until a scheduled query of the issue is
+    finished, see 'query_issues'.
+    """
+
+    def __init__(self, name):
+        """Construct attribute stored as 'name' with a leading underscore."""
+        self.name = '_' + name
+
+    def __get__(self, issue, owner=None):
+        """Return the value after waiting for the issue query."""
+        if issue is None:
+            return self
+        issue.wait()
+        return getattr(issue, self.name)
+
+    def __set__(self, issue, value):
+        """Set the value."""
+        setattr(issue, self.name, value)
+
+
 class Issue(object):
 
     """Issue with extra status info from issue tracker."""
 
-    def __init__(self, bugref, bugref_href, query_issue_status=False, progress_browser=None, bugzilla_browser=None):
-        """Construct an issue object with options."""
+    msg = _Resolved('msg')
+    json = _Resolved('json')
+    subject = _Resolved('subject')
+    status = _Resolved('status')
+    assignee = _Resolved('assignee')
+    resolution = _Resolved('resolution')
+    priority = _Resolved('priority')
+    queried = _Resolved('queried')
+    queried_at = _Resolved('queried_at')
+    pending = _Resolved('pending')
+    last_comment_date = _Resolved('last_comment_date')
+    issue_type = _Resolved('issue_type')
+    error = _Resolved('error')
+
+    def __init__(self, bugref, bugref_href, query_issue_status=False, progress_browser=None, bugzilla_browser=None, defer_query=False):
+        """Construct an issue object with options.
+
+        With 'defer_query' the issue tracker is not queried yet but left
+        'pending' for a later call of 'query', e.g. by 'query_issues'.
+        """
+        self.future = None
+        # query of the comments, see 'query_last_comment'
+        self.comments_future = None
         self.bugref = bugref
         self.bugref_href = bugref_href
         self.bugid = int(re.search('[a-zA-Z]*#([0-9]+)', bugref).group(1))
@@ -585,43 +968,67 @@ class Issue(object):
         self.resolution = None
         self.priority = None
         self.queried = False
+        # time of the query, see 'fresh'
+        self.queried_at = None
+        self.pending = False
         self.last_comment_date = None
         self.issue_type = None
         self.error = False
         self.progress_browser = progress_browser
         self.bugzilla_browser = bugzilla_browser
         if query_issue_status and progress_browser and bugzilla_browser:
-            log.debug("Retrieving bug data for %s" % bugref)
-            try:
-                if bugref.startswith('poo#'):
-                    log.debug("Test issue discovered, looking on progress")
-                    self.issue_type = 'redmine'
-                    self.json = progress_browser.get_json(bugref_href + '.json')['issue']
-                    self.status = self.json['status']['name']
-                    self.assignee = self.json['assigned_to']['name'] if 'assigned_to' in self.json else 'None'
-                    self.subject = self.json['subject']
-                    self.priority = self.json['priority']['name']
-                    self.last_comment_date = datetime.datetime.strptime(self.json['updated_on'], "%Y-%m-%dT%H:%M:%SZ")
-                # bugref.startswith('bsc#') or bugref.startswith('boo#')
-                else:
-                    log.debug("Product bug discovered, looking on bugzilla")
-                    self.issue_type = 'bugzilla'
-                    self.json = bugzilla_browser.json_rpc_get('/jsonrpc.cgi', 'Bug.get', {"ids": [self.bugid]})['result']['bugs'][0]
-                    self.status = self.json['status']
-                    if self.json.get('resolution'):
-                        self.resolution = self.json['resolution']
-                    self.assignee = self.json['assigned_to'] if 'assigned_to' in self.json else 'None'
-                    self.subject = self.json['summary']
-                    self.priority = self.json['priority'].split(' ')[0]
-                self.queried = True
-            except DownloadError as e:  # pragma: no cover
-                log.info("A download error has been encountered for bugref %s (%s): %s" % (bugref, bugref_href, e))
-                self.msg = str(e)
-                self.error = True
-            except TypeError as e:
-                log.error("Error retrieving details for bugref %s (%s): %s" % (bugref, bugref_href, e))
-                self.msg = "Ticket not found"
-                self.error = True
+            self.pending = True
+            if not defer_query:
+                self.query()
+
+    def wait(self):
+        """Wait for a scheduled query of the issue tracker, if any, to finish."""
+        if self.future and not getattr(_querying, 'active', False):
+            self.future.result()
+
+    def __getstate__(self):
+        """Return the state for pickling after a scheduled query finished."""
+        self.wait()
+        state = dict(self.__dict__)
+        state['future'] = None
+        state['comments_future'] = None
+        return state
+
+    def query(self, json=None):
+        """Retrieve the issue status from the issue tracker unless already retrieved data is provided as 'json'."""
+        self.pending = False
+        log.debug("Retrieving bug data for %s" % self.bugref)
+        try:
+            if self.bugref.startswith('poo#'):
+                log.debug("Test issue discovered, looking on progress")
+                self.issue_type = 'redmine'
+                self.json = json or self.progress_browser.get_json(self.bugref_href + '.json')['issue']
+                self.status = self.json['status']['name']
+                self.assignee = self.json['assigned_to']['name'] if 'assigned_to' in self.json else 'None'
+                self.subject = self.json['subject']
+                self.priority = self.json['priority']['name']
+                self.last_comment_date = datetime.datetime.strptime(self.json['updated_on'], "%Y-%m-%dT%H:%M:%SZ")
+            # bugref.startswith('bsc#') or bugref.startswith('boo#')
+            else:
+                log.debug("Product bug discovered, looking on bugzilla")
+                self.issue_type = 'bugzilla'
+                self.json = json or self.bugzilla_browser.json_rpc_get('/jsonrpc.cgi', 'Bug.get', {"ids": [self.bugid]})['result']['bugs'][0]
+                self.status = self.json['status']
+                if self.json.get('resolution'):
+                    self.resolution = self.json['resolution']
+                self.assignee = self.json['assigned_to'] if 'assigned_to' in self.json else 'None'
+                self.subject = self.json['summary']
+                self.priority = self.json['priority'].split(' ')[0]
+            self.queried = True
+            self.queried_at = time.time()
+        except DownloadError as e:  # pragma: no cover
+            log.info("A download error has been encountered for bugref %s (%s): %s" % (self.bugref, self.bugref_href, e))
+            self.msg = str(e)
+            self.error = True
+        except TypeError as e:
+            log.error("Error retrieving details for bugref %s (%s): %s" % (self.bugref, self.bugref_href, e))
+            self.msg = "Ticket not found"
+            self.error = True
 
     def add_comment(self, comment):
         """Add a comment to an issue with RPC/REST operations."""
@@ -640,6 +1047,15 @@ class Issue(object):
                 }
             })
 
+    @property
+    def fresh(self):
+        """Issue has been queried within the time to live of its ticket URL, see '--cache-ttl'."""
+        if not self.queried:
+            return False
+        browser = self.progress_browser if self.issue_type == 'redmine' else self.bugzilla_browser
+        ttl = url_ttl(self.bugref_href, browser.ttls)
+        return ttl is None or time.time() - self.queried_at < ttl
+
     @property
     def is_assigned(self):
         """Issue has been assigned."""
@@ -661,14 +1077,29 @@ class Issue(object):
         else:
             return True
 
+    def query_last_comment(self, executor=None):
+        """Retrieve the date of the last comment unless already known, with an 'executor' only scheduled to be waited for by 'last_comment'."""
+        if self.last_comment_date or self.comments_future:
+            return
+        if executor:
+            self.comments_future = executor.submit(_in_query, self._query_last_comment)
+        else:
+            self._query_last_comment()
+
+    def _query_last_comment(self):
+        assert self.issue_type == 'bugzilla'
+        res = self.bugzilla_browser.json_rpc_get('/jsonrpc.cgi', 'Bug.comments', {"ids": [self.bugid]})
+        comments = res['result']['bugs'][str(self.bugid)]['comments']
+        self.last_comment_date = datetime.datetime.strptime(comments[-1]['creation_time'], "%Y-%m-%dT%H:%M:%SZ")
+
     @property
     def last_comment(self):
         """Return datetime object of last comment retrieved from an issue."""
-        if not self.last_comment_date:
-            assert self.issue_type == 'bugzilla'
-            res = self.bugzilla_browser.json_rpc_get('/jsonrpc.cgi', 'Bug.comments', {"ids": [self.bugid]})
-            comments = res['result']['bugs'][str(self.bugid)]['comments']
-            self.last_comment_date = datetime.datetime.strptime(comments[-1]['creation_time'], "%Y-%m-%dT%H:%M:%SZ")
+        if self.comments_future:
+            future, self.comments_future = self.comments_future, None
+            # errors are raised on access the same as when querying right away
+            future.result()
+        self.query_last_comment()
         return self.last_comment_date
 
     def __str__(self):
@@ -690,6 +1121,168 @@ class Issue(object):
         )
 
 
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _query_bugzilla_batch(issues, since=None):
+    """Query all bugzilla 'issues' with one request, return False if the batch query is not possible.
+
+    With 'since' only bugs changed since that time are queried.
+    """
+    ids = sorted(set(issue.bugid for issue in issues))
+    try:
+        if since:
+            params = {'id': ids, 'last_change_time': since, 'include_fields': BUGZILLA_FIELDS}
+            res = issues[0].bugzilla_browser.json_rpc_get('/jsonrpc.cgi', 'Bug.search', params)
+        else:
+            res = issues[0].bugzilla_browser.json_rpc_get('/jsonrpc.cgi', 'Bug.get', {'ids': ids, 'include_fields': BUGZILLA_FIELDS, 'permissive': True})
+        bugs = {bug['id']: bug for bug in res['result']['bugs']}
+    except (DownloadError, KeyError, TypeError) as e:
+        log.debug("Could not query bugs %s at once, querying one by one: %s" % (ids, e))
+        return False
+    for issue in issues:
+        # unknown bugs are left pending to be handled by an individual query
+        if issue.bugid in bugs:
+            issue.query(bugs[issue.bugid])
+    return True
+
+
+def _query_redmine_batch(issues, since=None):
+    """Query all redmine 'issues' of one redmine instance following pagination, return False if the batch query is not possible.
+
+    With 'since' only issues updated since that time are queried.
+    """
+    ids = sorted(set(issue.bugid for issue in issues))
+    issues_url = issues[0].bugref_href.rsplit('/issues/', 1)[0] + '/issues.json'
+    params = OrderedDict([('issue_id', ','.join(map(str, ids))), ('status_id', '*')])
+    if since:
+        params['updated_on'] = '>=' + since
+    found = {}
+    try:
+        while True:
+            params.update([('limit', REDMINE_BATCH_SIZE), ('offset', len(found))])
+            res = issues[0].progress_browser.get_json('%s?%s' % (issues_url, urlencode(params)))
+            found.update({issue['id']: issue for issue in res['issues']})
+            if not res['issues'] or len(found) >= res['total_count']:
+                break
+    except (DownloadError, KeyError, TypeError) as e:
+        log.debug("Could not query issues %s at once, querying one by one: %s" % (ids, e))
+        return False
+    for issue in issues:
+        # unknown issues are left pending to be handled by an individual query
+        if issue.bugid in found:
+            issue.query(found[issue.bugid])
+    return True
+
+
+def _tracker(issue):
+    """Return a tuple identifying the issue tracker of 'issue' starting with its batch query function, e.g. '_query_bugzilla_batch'."""
+    if issue.bugref.startswith('poo#'):
+        return _query_redmine_batch, issue.progress_browser, issue.bugref_href.rsplit('/issues/', 1)[0]
+    return _query_bugzilla_batch, issue.bugzilla_browser, None
+
+
+def _batches(issues):
+    """Return chunks of pending 'issues' which can be queried together by a batch query function, e.g. '_query_bugzilla_batch'."""
+    batches = defaultdict(list)
+    for issue in issues:
+        if issue.pending:
+            batches[_tracker(issue)].append(issue)
+    for (query_batch, _, _), batch_issues in iteritems(batches):
+        batch_size = REDMINE_BATCH_SIZE if query_batch == _query_redmine_batch else BUGZILLA_BATCH_SIZE
+        for chunk in _chunks(batch_issues, batch_size):
+            yield query_batch, chunk
+
+
+def _refresh_from_issue_store(issues, issue_store, refresh=True):
+    """Query only those 'issues' found in 'issue_store' which changed since their last synchronization and take the others from the store.
+
+    Without 'refresh' all issues found in the store are taken from it without querying.
+    """
+    stored = {id(issue): issue_store.get(normalize_bugref(issue.bugref)) for issue in issues if issue.pending}
+    if not refresh:
+        for issue in issues:
+            if stored.get(id(issue)):
+                issue.query(stored[id(issue)][0])
+        return
+    for query_batch, chunk in _batches([issue for issue in issues if stored.get(id(issue))]):
+        if not query_batch(chunk, since=min(stored[id(issue)][1] for issue in chunk)):
+            continue
+        for issue in chunk:
+            if issue.pending:
+                issue.query(stored[id(issue)][0])
+
+
+def _query_chunk(chunk, query_batch=None):
+    if query_batch:
+        query_batch(chunk)
+    for issue in chunk:
+        if issue.pending:
+            issue.query()
+
+
+def query_issues(issues, issue_store=None, executor=None, refresh=True):
+    """Query issue trackers for all pending 'issues'.
+
+    Bugzilla bugs are queried in batches of up to 'BUGZILLA_BATCH_SIZE' ids,
+    redmine issues in batches of up to 'REDMINE_BATCH_SIZE' ids per request.
+    Everything not covered by a batch is queried individually.
+
+    With an 'executor' the queries are only scheduled and run concurrently
+    while the status attributes of each issue block until its own query is
+    finished.
+
+    With an 'issue_store', see 'openqa_review.cache.IssueStore', issues
+    already known are only queried if they changed since the last
+    synchronization and the store is updated with all queried issues, with
+    an 'executor' only by the caller calling 'update_issue_store' when the
+    issues are needed anyway to not wait for the queries here.
+    Without 'refresh' issues found in the store are taken from it as is, e.g.
+    when loading pages saved by a run which synchronized the store.
+    """
+    # issues shared between reports show up multiple times, issues already scheduled are skipped without waiting for them
+    issues = [issue for issue in OrderedDict((id(issue), issue) for issue in issues).values() if not issue.future and issue.pending]
+    if issue_store:
+        _refresh_from_issue_store(issues, issue_store, refresh)
+    chunks = [(chunk, query_batch) for query_batch, chunk in _batches(issues) if len(set(issue.bugid for issue in chunk)) > 1]
+    batched = set(id(issue) for chunk, _ in chunks for issue in chunk)
+    chunks += [([issue], None) for issue in issues if issue.pending and id(issue) not in batched]
+    for chunk, query_batch in chunks:
+        if executor:
+            future = executor.submit(_in_query, _query_chunk, chunk, query_batch)
+            for issue in chunk:
+                issue.future = future
+        else:
+            _query_chunk(chunk, query_batch)
+    if issue_store and refresh and not executor:
+        update_issue_store(issue_store, issues)
+
+
+def update_issue_store(issue_store, issues):
+    """Store the data of all queried 'issues' in 'issue_store'.
+
+    The time of synchronization is taken from each issue tracker as the
+    newest change of the issues queried from it, so changes are not missed
+    if the clock of this host is ahead of the issue tracker. Issues without
+    a known time of change are left as stored.
+    """
+    by_tracker = defaultdict(list)
+    for issue in issues:
+        if issue.queried:
+            by_tracker[_tracker(issue)].append(issue)
+    for tracker_issues in by_tracker.values():
+        changed = [(issue, issue.json.get('last_change_time') or issue.json.get('updated_on')) for issue in tracker_issues]
+        changed = [(issue, change_time) for issue, change_time in changed if change_time]
+        if changed:
+            issue_store.update(((normalize_bugref(issue.bugref), issue.json) for issue, _ in changed), max(t for _, t in changed))
+
+
+def normalize_bugref(bugref):
+    """Return 'bugref' with the different prefixes of the same bugzilla, e.g. 'bnc#' or 'boo#', canonicalized to 'bsc#'."""
+    return re.sub('^(bnc|boo)#', 'bsc#', bugref)
+
+
 class IssueEntry(object):
 
     """List of failed test scenarios with corresponding bug."""
@@ -703,6 +1296,16 @@ class IssueEntry(object):
         self.root_url = root_url
         self.test_browser = test_browser
 
+    def __getstate__(self):
+        """Return the state for pickling without browsers and with the issue only by its reference, to be attached again by 'ArchReport.adopt'.
+
+        Browsers hold the credentials of the issue trackers which must not end up e.g. in the state file.
+        """
+        state = dict(self.__dict__)
+        state['test_browser'] = bool(self.test_browser)
+        state['bug'] = {'bugref': self.bug.bugref, 'bugref_href': self.bug.bugref_href} if self.bug else None
+        return state
+
     def _url(self, v):
         """Absolute url e.g. for test references."""
         return absolute_url(self.root_url, v)
@@ -710,10 +1313,16 @@ class IssueEntry(object):
     def _format_failure_modules(self, failedmodules):
         return ', '.join(m['name'] for m in failedmodules)
 
+    def _report_link(self, f):
+        """Return issue report link of a failure, only generated once as it needs to parse the job page."""
+        if 'report_link' not in f:
+            f['report_link'] = issue_report_link(self.root_url, f, self.test_browser)
+        return f['report_link']
+
     def _format_failure(self, f):
         """Yield a report entry for one new issue based on verbosity."""
         failure_modules_str = ' "Failed modules: %s"' % self._format_failure_modules(f['failedmodules']) if f['failedmodules'] else ''
-        report_str = issue_report_link(self.root_url, f, self.test_browser) if (self.args.report_links and self.test_browser) else ''
+        report_str = self._report_link(f) if (self.args.report_links and self.test_browser) else ''
         if self.args.verbose_test >= 3 and 'prev' in f:
             return '[%s](%s%s) [(ref)](%s "Previous test")%s' % (
                 f['name'], self._url(f),
@@ -740,18 +1349,36 @@ class IssueEntry(object):
         return map(lambda f: cls(args, root_url, [f], test_browser), failures)
 
 
+def _issue_types():
+    # a module level function instead of a lambda to keep reports picklable
+    return defaultdict(list)
+
+
 class ArchReport(object):
 
     """Report for a single architecture."""
 
-    def __init__(self, arch, results, args, root_url, progress_browser, bugzilla_browser, test_browser):
-        """Construct an archreport object with options."""
+    def __init__(self, arch, results, args, root_url, progress_browser, bugzilla_browser, test_browser, defer_issue_query=False, issue_registry=None):
+        """Construct an archreport object with options.
+
+        With 'defer_issue_query' the status of referenced issues is left to be
+        queried by the caller, e.g. together with other reports.
+
+        'issue_registry' is a dict of 'Issue' objects by normalized bugref
+        which can be shared between reports so that each ticket is only
+        represented and looked up once.
+        """
         self.arch = arch
         self.args = args
         self.root_url = root_url
         self.progress_browser = progress_browser
         self.bugzilla_browser = bugzilla_browser
         self.test_browser = test_browser
+        self.issue_registry = issue_registry if issue_registry is not None else {}
+        # job pages parsed while constructing the report, shared by the lookup of soft fails and report links
+        self._parsed = {}
+        # False if content could not be retrieved and was skipped, e.g. the bugref of a soft fail, see '--state-file'
+        self.complete = True
 
         self.status_badge = set_status_badge([i['state'] for i in results.values()])
 
@@ -762,21 +1389,31 @@ class ArchReport(object):
         # scenarios, ...
         # ... else (no ticket linked) we don't group them as we don't know if it really is the same issue and handle them outside
         results_by_bugref = SortedDict(get_results_by_bugref(results, self.args))
-        self.issues = defaultdict(lambda: defaultdict(list))
+        self.issues = defaultdict(_issue_types)
         for bugref, result_list in iteritems(results_by_bugref):
             if not re.match('(poo|bsc|boo)#', bugref):
                 log.info('Skipping unknown bugref \'%s\' in \'%s\'' % (bugref, result_list))
                 continue
-            bug = result_list[0]
-            issue = Issue(bug['bugref'], bug['bugref_href'], self.args.query_issue_status, self.progress_browser, self.bugzilla_browser)
+            issue = self._issue(result_list[0])
             self.issues[issue_state(result_list)][issue_type(bugref)].append(IssueEntry(self.args, self.root_url, result_list, bug=issue))
-
-        # left to handle are the issues marked with 'todo'
-        todo_results = results_by_bugref.get('todo', [])
+        if not defer_issue_query:
+            query_issues(self.bugs)
+
+        # entries without a referenced issue would only be dropped by the filter later
+        if not only_issue_entries(self.args):
+            self._add_todo_entries(results_by_bugref.get('todo', []))
+        if self.args.report_links and self.test_browser:
+            # only entries with a test browser get report links, they do not reference an issue so no issue status is waited for
+            ies = [ie for issue_types in self.issues.values() for ies in issue_types.values() for ie in ies if ie.test_browser]
+            add_report_links([ie for ie in ies if kept_by_outputs(ie, self.args)], self.root_url, self.test_browser, self._parsed)
+        del self._parsed
+
+    def _add_todo_entries(self, todo_results):
+        """Add entries for the issues marked with 'todo'."""
         new_issues = (r for r in todo_results if r['state'] == 'NEW_ISSUE')
-        self.issues['new']['todo'].extend(IssueEntry.for_each(self.args, self.root_url, new_issues, test_browser))
+        self.issues['new']['todo'].extend(IssueEntry.for_each(self.args, self.root_url, new_issues, self.test_browser))
         existing_issues = (r for r in todo_results if r['state'] == 'STILL_FAILING')
-        self.issues['existing']['todo'].extend(IssueEntry.for_each(self.args, self.root_url, existing_issues, test_browser))
+        self.issues['existing']['todo'].extend(IssueEntry.for_each(self.args, self.root_url, existing_issues, self.test_browser))
         if self.args.include_softfails:
             new_soft_fails = [r for r in todo_results if r['state'] == 'NEW_SOFT_ISSUE']
             existing_soft_fails = [r for r in todo_results if r['state'] == 'STILL_SOFT_FAILING']
@@ -785,30 +1422,78 @@ class ArchReport(object):
             if existing_soft_fails:
                 self.issues['existing']['product'].append(IssueEntry(self.args, self.root_url, existing_soft_fails))
 
+    def __getstate__(self):
+        """Return the state for pickling without browsers and issues, to be attached again by 'adopt', see 'IssueEntry.__getstate__'."""
+        state = dict(self.__dict__)
+        state.update(progress_browser=None, bugzilla_browser=None, test_browser=None, issue_registry=None)
+        return state
+
+    def adopt(self, args, test_browser, progress_browser, bugzilla_browser, issue_registry):
+        """Attach the report to the options, browsers and issues of the current process, e.g. after being created in another process.
+
+        The issues of this report are replaced by the corresponding not yet
+        queried ones of 'issue_registry' which are added if missing.
+        """
+        self.args, self.test_browser, self.progress_browser, self.bugzilla_browser = args, test_browser, progress_browser, bugzilla_browser
+        self.issue_registry = issue_registry
+        for ies in (ies for issue_types in self.issues.values() for ies in issue_types.values()):
+            for ie in ies:
+                ie.args = args
+                ie.test_browser = test_browser if ie.test_browser else None
+                if ie.bug:
+                    ie.bug = self._issue(ie.bug if isinstance(ie.bug, dict) else {'bugref': ie.bug.bugref, 'bugref_href': ie.bug.bugref_href})
+
+    def _issue(self, bug):
+        key = normalize_bugref(bug['bugref'])
+        if key not in self.issue_registry:
+            self.issue_registry[key] = Issue(bug['bugref'], bug['bugref_href'], self.args.query_issue_status, self.progress_browser, self.bugzilla_browser,
+                                             defer_query=True)
+        return self.issue_registry[key]
+
     def _search_for_bugrefs_for_softfailures(self, results):
-        for k, v in iteritems(results):
-            if v['state'] in soft_fail_states:
-                try:
-                    module_url = self._get_url_to_softfailed_module(v['href'])
-                    module_name = re.search("[^/]*/[0-9]*/[^/]*/([^/]*)/[^/]*/[0-9]*", module_url).group(1)
-                    assert module_name, 'could not find a module name within %s in job %s' % (module_url, v['href'])
-                    v['bugref'] = self._get_bugref_for_softfailed_module(v, module_name)
-                    if not v['bugref']:  # pragma: no cover
-                        continue
-                except AttributeError:  # pragma: no cover
-                    log.info('Could find neither soft failed info box nor needle, assuming an old openQA job, skipping.')
-                    continue
-                except DownloadError as e:  # pragma: no cover
-                    log.error("Failed to process %s with error %s. Skipping current result" % (v, e))
-                    continue
-                match = re.search('([a-z]{3})#?([0-9]+)', v['bugref'])
-                if not match:  # pragma: no cover
-                    log.info('Could not find bug reference in text \'%s\', skipping.' % v['bugref'])
-                    continue
-                bugref, bug_id = match.group(1), match.group(2)
-                assert bugref, "No bugref found for %s" % v
-                assert bug_id, "No bug_id found for %s" % v
-                v['bugref_href'] = issue_tracker[bugref](bug_id)
+        """Set the bugref of soft failed results to the one referenced within the job.
+
+        The jobs are resolved concurrently with up to 'max_connections' of
+        the test browser, each with its own chain of dependent requests.
+        Failing to resolve one job only skips that result.
+        """
+        soft_failed = [v for v in results.values() if v['state'] in soft_fail_states]
+        workers = min(self.test_browser.max_connections, len(soft_failed))
+        if workers <= 1:
+            bugrefs = [self._get_bugref_for_softfailed_job(v) for v in soft_failed]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                bugrefs = list(executor.map(self._get_bugref_for_softfailed_job, soft_failed))
+        for v, bugref in zip(soft_failed, bugrefs):
+            if not bugref:
+                continue
+            v['bugref'] = bugref
+            match = re.search('([a-z]{3})#?([0-9]+)', bugref)
+            if not match:  # pragma: no cover
+                log.info('Could not find bug reference in text \'%s\', skipping.' % bugref)
+                continue
+            v['bugref_href'] = issue_tracker[match.group(1)](match.group(2))
+
+    def _get_bugref_for_softfailed_job(self, result_item):
+        """Return the bugref text referenced within the soft failed job of 'result_item', None if it can not be found."""
+        try:
+            details = self._get_softfailed_details_from_api(result_item['href'])
+            if details is not None:
+                return self._get_bugref_from_details(result_item, details)
+            module_url = self._get_url_to_softfailed_module(result_item['href'])
+            module_name = re.search("[^/]*/[0-9]*/[^/]*/([^/]*)/[^/]*/[0-9]*", module_url).group(1)
+            assert module_name, 'could not find a module name within %s in job %s' % (module_url, result_item['href'])
+            return self._get_bugref_for_softfailed_module(result_item, module_name)
+        except AttributeError:  # pragma: no cover
+            log.info('Could find neither soft failed info box nor needle, assuming an old openQA job, skipping.')
+        except DownloadError as e:
+            log.error("Failed to process %s with error %s. Skipping current result" % (result_item, e))
+            self.complete = False
+
+    @property
+    def bugs(self):
+        """Return list of all 'Issue' objects referenced in this report."""
+        return [ie.bug for issue_types in self.issues.values() for ies in issue_types.values() for ie in ies if ie.bug]
 
     @property
     def total_issues(self):
@@ -820,18 +1505,46 @@ class ArchReport(object):
         return total
 
     def _get_url_to_softfailed_module(self, job_url):
-        test_details_html = self.test_browser.get_soup(job_url).find(title="Soft Failed")
+        test_details_page = parsed_page(self.test_browser, job_url, self._parsed)
+        test_details_html = test_details_page.find(title="Soft Failed")
         if test_details_html is None:
             log.debug('Could not find soft failed info box, looking for workaround needle in job %s' % job_url)
-            test_details_html = self.test_browser.get_soup(job_url).find(class_='resborder_softfailed').parent
+            test_details_html = test_details_page.find(class_='resborder_softfailed').parent
         assert test_details_html, 'Found neither soft failed info box nor workaround needle'
         return test_details_html.get('data-url')
 
+    def _get_softfailed_details_from_api(self, job_url):
+        """Return the step details of the soft failed modules of the job from the job details API, None if not available.
+
+        One request replaces scraping the job page and the details of the
+        soft failed module, older openQA versions without the API or not
+        providing module results are handled by the caller. Once the API is
+        not found it is not tried again for other jobs.
+        """
+        if JOB_DETAILS_API in self.test_browser.missing_apis:
+            return None
+        job_id = re.search('/tests/([0-9]+)', job_url).group(1)
+        try:
+            job = self.test_browser.get_json(JOB_DETAILS_API % job_id)['job']
+        except NotFoundError:
+            log.info('Job details API not provided by %s, scraping job pages instead' % self.root_url)
+            self.test_browser.missing_apis.add(JOB_DETAILS_API)
+            return None
+        except DownloadError:
+            log.debug('Job details API not available for job %s, scraping the job page' % job_url)
+            return None
+        details = [field for module in job.get('testresults', []) if module.get('result') == 'softfailed' for field in module.get('details', [])]
+        return details or None
+
     def _get_bugref_for_softfailed_module(self, result_item, module_name):
-        details_json = json.loads(self.test_browser.get_soup("%s/file/details-%s.json" % (result_item['href'], module_name)).getText())
+        details_json = self.test_browser.get_json("%s/file/details-%s.json" % (result_item['href'], module_name))
+        return self._get_bugref_from_details(result_item, details_json)
+
+    def _get_bugref_from_details(self, result_item, details_json):
         for field in details_json:
             if 'title' in field and 'Soft Fail' in field['title']:
-                unformated_str = self.test_browser.get_soup("%s/file/%s" % (result_item['href'], field['text'])).getText()
+                # newer openQA versions include the content of text results
+                unformated_str = field.get('text_data') or self.test_browser.get_page("%s/file/%s" % (result_item['href'], field['text']))
                 return re.search("Soft Failure:\n([^/]*)", unformated_str.strip()).group(1)
             elif 'properties' in field and len(field['properties']) > 0 and field['properties'][0] == 'workaround':
                 log.debug('Evaluating potential workaround needle \'%s\'' % field['needle'])
@@ -868,21 +1581,31 @@ class ProductReport(object):
 
     """Read overview page of one job group and generate a report for the product."""
 
-    def __init__(self, browser, job_group_url, root_url, args):
-        """Construct a product report object with options."""
+    def __init__(self, browser, job_group_url, root_url, args, progress_browser=None, bugzilla_browser=None, defer_issue_query=False,
+                 issue_registry=None, results_cache=None):
+        """Construct a product report object with options.
+
+        Browsers for the issue trackers can be passed to be shared between
+        product reports, otherwise they are created on demand. For
+        'defer_issue_query' and 'issue_registry' see 'ArchReport', for
+        'results_cache' see 'extract_overview'.
+        """
         self.args = args
         self.job_group_url = job_group_url
         self.group = job_group_url.split('/')[-1]
         current_url, previous_url = get_build_urls_to_compare(browser, job_group_url, args.builds, args.against_reviewed, args.running_threshold)
         # read last finished
-        current_details = browser.get_soup(current_url)
-        previous_details = browser.get_soup(previous_url)
+        if hasattr(args, 'data_source') and args.data_source == 'api':
+            current_details, previous_details = (api_overview(browser, url, args.bugrefs) for url in (current_url, previous_url))
+        else:
+            current_details, previous_details = (extract_overview(page, results_cache) for page in browser.get_many([current_url, previous_url]))
         for details in current_details, previous_details:
-            assert sum(int(badge.text) for badge in details.find_all(class_='badge')) > 0, \
+            assert details.badges_total > 0, \
                 "invalid page with no test results found reading %s and %s, make sure you specified valid builds (leading zero missing?)" \
                 % (current_url, previous_url)
-        current_summary = parse_summary(current_details)
-        previous_summary = parse_summary(previous_details)
+            browser.add_finished_jobs(finished_job_ids(details))
+        current_summary = current_details.summary
+        previous_summary = previous_details.summary
 
         changes = {k: v - previous_summary.get(k, 0) for k, v in iteritems(current_summary) if k != 'none' and k != 'incomplete'}
         log.info("Changes since last build:\n\t%s" % '\n\t'.join("%s: %s" % (k, v) for k, v in iteritems(changes)))
@@ -891,7 +1614,7 @@ class ProductReport(object):
         self.ref_build = get_build_nr(previous_url)
 
         # for each architecture iterate over all
-        cur_archs, prev_archs = (set(arch.text for arch in details.find_all('th', id=re.compile('flavor_'))) for details in [current_details, previous_details])
+        cur_archs, prev_archs = current_details.archs, previous_details.archs
         archs = cur_archs
         if args.arch:
             assert args.arch in cur_archs, "Selected arch {} was not found in test results {}".format(args.arch, cur_archs)
@@ -903,11 +1626,29 @@ class ProductReport(object):
 
         # create arch reports
         self.reports = SortedDict()
-        progress_browser = progress_browser_factory(args) if args.query_issue_status else None
-        bugzilla_browser = bugzilla_browser_factory(args) if args.query_issue_status else None
+        issue_registry = issue_registry if issue_registry is not None else {}
+        if args.query_issue_status:
+            progress_browser = progress_browser or progress_browser_factory(args)
+            bugzilla_browser = bugzilla_browser or bugzilla_browser_factory(args)
         for arch in sorted(archs):
             results = get_arch_state_results(arch, current_details, previous_details, args.output_state_results)
-            self.reports[arch] = ArchReport(arch, results, args, root_url, progress_browser, bugzilla_browser, browser)
+            self.reports[arch] = ArchReport(arch, results, args, root_url, progress_browser, bugzilla_browser, browser, defer_issue_query=True,
+                                            issue_registry=issue_registry)
+        # also content skipped before the deadline might be missing, see '--deadline'
+        self.complete = all(report.complete for report in self.reports.values()) and not (browser.deadline and time.time() >= browser.deadline)
+        if not defer_issue_query:
+            query_issues(self.bugs)
+
+    @property
+    def bugs(self):
+        """Return list of all 'Issue' objects referenced in this report."""
+        return [bug for report in self.reports.values() for bug in report.bugs]
+
+    def adopt(self, args, browser, progress_browser, bugzilla_browser, issue_registry):
+        """Attach the report to the options, browsers and issues of the current process, see 'ArchReport.adopt'."""
+        self.args = args
+        for report in self.reports.values():
+            report.adopt(args, browser, progress_browser, bugzilla_browser, issue_registry)
 
     def __str__(self):
         """Return report for product."""
@@ -932,7 +1673,20 @@ class CustomFormatter(argparse.ArgumentDefaultsHelpFormatter, argparse.RawDescri
     pass
 
 
-def parse_args():
+def output_spec(value):
+    """Parse the specification of an output 'FORMAT[+FILTER]:PATH' into a tuple, see '--output'."""
+    match = re.match(r'^(md|html)(?:\+(\w+))?:(.+)$', value)
+    if not match:
+        raise argparse.ArgumentTypeError("invalid output '%s', expected FORMAT[+FILTER]:PATH with FORMAT one of 'md', 'html'" % value)
+    output_format, iefilter, path = match.groups()
+    if iefilter and iefilter not in ie_filters:
+        raise argparse.ArgumentTypeError("invalid filter '%s' in output '%s', choose from %s" % (iefilter, value, ', '.join(sorted(ie_filters.keys()))))
+    if output_format == 'html' and not markdown_available:  # pragma: no cover
+        raise argparse.ArgumentTypeError("output format 'html' needs the python module 'markdown'")
+    return output_format, iefilter, path
+
+
+def create_parser():
     parser = argparse.ArgumentParser(description=__doc__, formatter_class=CustomFormatter)
     parser.add_argument('-v', '--verbose',
                         help="Increase verbosity level, specify multiple times to increase verbosity",
@@ -973,15 +1727,44 @@ def parse_args():
     parser.add_argument('-R', '--query-issue-status', action='store_true',
                         help="""Query issue trackers for the issues found and report on their status and assignee. Implies "-r/--bugrefs" and
                         needs configuration file {} with credentials, see '--query-issue-status-help'.""".format(CONFIG_PATH))
+    parser.add_argument('--issue-store',
+                        help="""SQLite database file to keep the status of issues in between runs. With "-R/--query-issue-status" only
+                        issues changed since the last run are queried from the issue trackers. With "--load" issues found in the store
+                        are taken from it as synchronized by the run saving the pages.""")
     parser.add_argument('--query-issue-status-help', action='store_true',
                         help="""Shows help how to setup '--query-issue-status' configuration file.""")
     parser.add_argument('--report-links', action='store_true',
                         help="""Generate issue reporting links into report. Needs configuration file for product mapping,
                         see '--query-issue-status-help'.""")
+    parser.add_argument('--data-source', choices=['html', 'api'], default='html',
+                        help="""Where to read test results of builds from, either the overview pages or the
+                        openQA jobs API plus job comments for bugrefs. The API does not provide failed needles.""")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="""Number of job groups to process in parallel by separate processes. Retrieved pages are only shared
+                        between the processes by persistent caches, e.g. '--cache-dir', '--load' or '--save'.""")
+    parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                        help="""Maximum time in seconds for generating the report. When exceeded no more requests are issued and a
+                        partial report is generated, job groups not finished in time or failing to be retrieved are marked as
+                        unfinished, issues not queried in time are marked with an error.""")
     parser.add_argument('-a', '--arch',
                         help='Only single architecture, e.g. \'x86_64\', not all')
-    parser.add_argument('-f', '--filter',
-                        help='Filter for \'closed\' or \'unassigned\' issues.')
+    parser.add_argument('-f', '--filter', choices=sorted(ie_filters.keys()),
+                        help="""Filter for 'closed' or 'unassigned' issues. Entries not referencing any issue are skipped already
+                        while processing the job groups.""")
+    parser.add_argument('--output', action='append', type=output_spec, metavar='FORMAT[+FILTER]:PATH',
+                        help="""Write the report to PATH, '-' for stdout, instead of printing it. Can be specified multiple times to render
+                        multiple outputs from the same collected data. FORMAT is one of 'md' or 'html', the latter needs the python module
+                        'markdown'. The optional FILTER is applied to this output only, see '--filter'.""")
+    parser.add_argument('--results-cache-dir',
+                        help="""Directory to keep the test results extracted from overview pages in, stored as configured by
+                        '--cache-backend' and '--cache-max-size'. Overview pages with the same content as before are not parsed again.""")
+    parser.add_argument('--state-file',
+                        help="""File to record the compared builds and their results of each job group together with its report. Reports
+                        of job groups which did not change since the last run are reused from it instead of processing them again.
+                        Reports missing content which could not be retrieved are not recorded.""")
+    parser.add_argument('--stream', action='store_true',
+                        help="""Write the section of each job group as soon as it is processed instead of the complete report at the end.
+                        Issues are then queried for each job group separately.""")
     parser.add_argument('--running-threshold', default=0,
                         help='Percentage of jobs that may still be running for the build to be considered \'finished\' anyway')
     parser.add_argument('--no-empty-sections', action='store_false', default=True, dest='show_empty',
@@ -1002,8 +1785,16 @@ def parse_args():
                                    help="""Do not actually change any tickets.""")
     reminder_comments.add_argument('--min-days-unchanged', default=MIN_DAYS_UNCHANGED,
                                    help="""The minimum period of days that need to be passed since the last comment for the bug to be reminded upon.""")
+    add_connection_args(parser)
+    add_memory_cache_args(parser)
     add_load_save_args(parser)
-    args = parser.parse_args()
+    add_job_cache_args(parser)
+    return parser
+
+
+def parse_args(parser=None, argv=None):
+    """Parse command line arguments 'argv', by default of the process, with the parser of 'create_parser' or 'parser'."""
+    args = (parser or create_parser()).parse_args(argv)
     if args.query_issue_status_help:
         print(CONFIG_USAGE)
         print("Expected file path: {}".format(CONFIG_PATH))
@@ -1058,12 +1849,158 @@ def get_job_groups(browser, root_url, args):
     return SortedDict(job_groups)
 
 
+# options which the report of a job group depends on, see 'group_state'
+STATE_OPTIONS = ['arch', 'builds', 'against_reviewed', 'running_threshold', 'bugrefs', 'include_softfails', 'query_issue_status', 'report_links',
+                 'verbose_test', 'output_state_results', 'show_empty', 'data_source']
+
+# version of the format of the state file, see '--state-file'
+STATE_VERSION = 2
+
+
+def group_state(browser, job_group_url, args):
+    """Return a digest of the compared builds of a job group, their results and the options or None if there are not enough finished builds.
+
+    The report of a job group with unchanged state can be reused.
+    """
+    try:
+        current_url, previous_url = get_build_urls_to_compare(browser, job_group_url, args.builds, args.against_reviewed, args.running_threshold)
+    except NotEnoughBuildsError:
+        return None
+    results = get_group_result(browser.get_json('%s.json' % job_group_url))
+    state = {
+        'urls': [current_url, previous_url],
+        'results': [results.get(get_build_nr(url)) for url in (current_url, previous_url)],
+        'options': {option: getattr(args, option, None) for option in STATE_OPTIONS},
+        'only_issue_entries': only_issue_entries(args),
+    }
+    return hashlib.sha1(json.dumps(state, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_state(path):
+    """Return the reports of job groups with their state recorded in the state file 'path', empty if missing or not readable."""
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state['groups']
+        log.info("Ignoring state file %s of an incompatible version" % path)
+    except (IOError, OSError, EOFError, AttributeError, ImportError, IndexError, KeyError, pickle.UnpicklingError) as e:
+        log.info("Could not read state file %s: %s" % (path, e))
+    return {}
+
+
+def save_state(path, groups):
+    """Write the reports of job groups with their state to the state file 'path'."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': STATE_VERSION, 'groups': groups}, f, pickle.HIGHEST_PROTOCOL)
+    os.rename(tmp_path, path)
+
+
+def unfinished_note(reason):
+    """Return the note replacing the report of a job group not finished in time, see '--deadline'."""
+    return "**Unfinished**: the report of this job group could not be completed: %s" % reason
+
+
+def open_results_cache(args):
+    """Return the store of '--results-cache-dir' limited to '--cache-max-size', None if not configured, to be opened once per process."""
+    if not (hasattr(args, 'results_cache_dir') and args.results_cache_dir):
+        return None
+    return open_store(args.results_cache_dir, args.cache_backend if hasattr(args, 'cache_backend') else 'directory',
+                      args.cache_max_size if hasattr(args, 'cache_max_size') else None)
+
+
+def product_report(browser, job_group_url, root_url, args, progress_browser=None, bugzilla_browser=None, issue_registry=None, results_cache=None):
+    """Return 'ProductReport' of one job group or a note if not enough builds are finished, also used within worker processes.
+
+    With a deadline a job group which can not be retrieved is marked as
+    unfinished instead of failing the whole report, see '--deadline'.
+    """
+    try:
+        return ProductReport(browser, job_group_url, root_url, args, progress_browser, bugzilla_browser, defer_issue_query=True,
+                             issue_registry=issue_registry, results_cache=results_cache)
+    except NotEnoughBuildsError as e:
+        log.debug("Catched 'not enough builds': %s" % e)
+        return "Not enough finished builds found"
+    except DownloadError as e:
+        if not (hasattr(args, 'deadline_at') and args.deadline_at):
+            raise
+        log.warning("Could not finish report of job group %s: %s" % (job_group_url, e))
+        return unfinished_note(e)
+
+
+# browsers and options shared by all job groups processed within a worker process of '--jobs', see '_init_worker'
+_worker = {}
+
+
+def _init_worker(worker_config, browser, root_url, args, progress_browser, bugzilla_browser):
+    """Initialize a worker process with the configuration of the main process and the browsers reused for each of its job groups."""
+    global config
+    config = worker_config
+    _worker.update(browser=browser, root_url=root_url, args=args, progress_browser=progress_browser, bugzilla_browser=bugzilla_browser,
+                   results_cache=open_results_cache(args))
+    # worker processes end without returning to the caller, see 'Browser.close'
+    for closable in (browser, progress_browser, bugzilla_browser, _worker['results_cache']):
+        if closable:
+            multiprocessing.util.Finalize(closable, closable.close, exitpriority=10)
+
+
+def _worker_product_report(job_group_url, worker_state=None):
+    """Return 'product_report' of 'job_group_url' within a worker process initialized by '_init_worker'.
+
+    Without initializer of the process pool the arguments of '_init_worker'
+    are passed as 'worker_state' with each job group instead.
+    """
+    if worker_state is None:
+        return product_report(_worker['browser'], job_group_url, _worker['root_url'], _worker['args'], _worker['progress_browser'],
+                              _worker['bugzilla_browser'], results_cache=_worker['results_cache'])
+    global config
+    config, browser, root_url, args, progress_browser, bugzilla_browser = worker_state
+    results_cache = open_results_cache(args)
+    try:
+        return product_report(browser, job_group_url, root_url, args, progress_browser, bugzilla_browser, results_cache=results_cache)
+    finally:
+        for closable in (browser, progress_browser, bugzilla_browser, results_cache):
+            if closable:
+                closable.close()
+
+
+def _worker_pool(jobs, worker_state):
+    """Return a pool of 'jobs' worker processes for '_worker_product_report' and the state to pass with each job group, None if already passed."""
+    if pool_initializer_available:
+        # the configuration and browsers are copied once to each worker process, not relying on them being inherited by forking
+        return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=worker_state), None
+    return ProcessPoolExecutor(max_workers=jobs), worker_state
+
+
+def report_section(product, pr):
+    """Return the markdown section of the job group 'product' with report 'pr'."""
+    return '# %s\n\n%s\n---\n' % (product, pr)
+
+
 class Report(object):
 
     """openQA review report."""
 
-    def __init__(self, browser, args, root_url, job_groups):
-        """Create openQA review report."""
+    def __init__(self, browser, args, root_url, job_groups, stream=False, progress_browser=None, bugzilla_browser=None, issue_executor=None,
+                 issue_registry=None):
+        """Create openQA review report.
+
+        With 'args.jobs' job groups are processed in parallel by multiple
+        processes, the results are merged in the same order as processed
+        sequentially.
+
+        With 'stream' the job groups are only processed when iterating over
+        'stream' so that each one can be rendered as soon as it is complete.
+
+        Browsers for the issue trackers and the 'issue_executor' querying
+        them are created unless passed, only a created executor is shut down
+        by 'close'.
+
+        The 'issue_registry' of a previous report can be passed to reuse its
+        issues which are still 'fresh', each by a copy so that the issues of
+        the previous report are not changed. All other issues are queried.
+        """
         self.browser = browser
         self.args = args
         self.root_url = root_url
@@ -1072,38 +2009,139 @@ class Report(object):
         self._label = 'Gathering data and processing report'
         self._progress = 0
         self.report = SortedDict()
-
+        # issue tracker browsers are shared by all job groups to reuse their connections
+        self.progress_browser = (progress_browser or progress_browser_factory(args)) if args.query_issue_status else None
+        self.bugzilla_browser = (bugzilla_browser or bugzilla_browser_factory(args)) if args.query_issue_status else None
+        # issues are resolved in the background and only waited for when their status is needed
+        self._own_issue_executor = args.query_issue_status and not issue_executor
+        self.issue_executor = (issue_executor or issue_executor_factory(self.progress_browser, self.bugzilla_browser)) if args.query_issue_status else None
+        # each ticket is represented by one issue shared by all job groups and architectures
+        self.issue_registry = {key: copy.copy(issue) for key, issue in iteritems(issue_registry or {}) if issue.fresh} \
+            if args.query_issue_status else {}
+        self.state_file = args.state_file if hasattr(args, 'state_file') else None
+        # opened while processing, see '_process'
+        self.results_cache = None
+        self._processing = self._process(stream)
+        if not stream:
+            for _ in self._processing:
+                pass
+
+    def _process(self, stream):
+        """Process all job groups, with 'stream' yielding the name of each job group as soon as its report is complete."""
+        args, browser, root_url, job_groups = self.args, self.browser, self.root_url, self.job_groups
+        issue_store = IssueStore(args.issue_store) if args.query_issue_status and hasattr(args, 'issue_store') and args.issue_store else None
+        # the store was synchronized by the run saving the pages, the responses for querying changes since then are not saved
+        refresh_issues = not args.load
+        # worker processes open their own, see '_init_worker'
+        self.results_cache = open_results_cache(args)
+        jobs = min(args.jobs if hasattr(args, 'jobs') and args.jobs else 1, len(job_groups))
+        pool, worker_state = _worker_pool(jobs, (config, browser, root_url, args, self.progress_browser, self.bugzilla_browser)) if jobs > 1 else (None, None)
+        states, reusable = self._reusable_reports()
+        # issues are copied from the worker processes and attached to the ones of this process afterwards
+        futures = {k: pool.submit(_worker_product_report, v, worker_state) for k, v in iteritems(job_groups) if k not in reusable} if pool else {}
         for k, v in iteritems(job_groups):
             log.info("Processing '%s'" % v)
             if args.no_progress or not humanfriendly_available:
-                self.report[k] = self._one_report(v)
+                self.report[k] = self._one_report(v, futures.get(k), reusable.get(k))
             else:
                 with AutomaticSpinner(label=self._next_label()):
-                    self.report[k] = self._one_report(v)
+                    self.report[k] = self._one_report(v, futures.get(k), reusable.get(k))
             self._progress += 1
+            if stream:
+                # the issues of the job group are needed right away to render it
+                if isinstance(self.report[k], ProductReport):
+                    query_issues(self.report[k].bugs, issue_store, self.issue_executor, refresh_issues)
+                yield k
+        if pool:
+            pool.shutdown()
+        self._drop_unreferenced_issues()
+        if self.results_cache:
+            self.results_cache.close()
+        self._query_issues(issue_store, refresh_issues)
+        if self.state_file:
+            # reports missing content are generated again on the next run even if the state is unchanged
+            save_state(self.state_file, {v: (states[k], self.report[k]) for k, v in iteritems(job_groups)
+                                         if states.get(k) and isinstance(self.report[k], ProductReport) and self.report[k].complete})
         if not args.no_progress:
             sys.stderr.write("\r%s\n" % self._next_label())  # It's nice to see 100%, too :-)
 
-    def _one_report(self, job_group_url):
+    def _query_issues(self, issue_store, refresh_issues):
+        """Query the issues of all job groups at once to batch requests to the issue trackers and update the 'issue_store', if any."""
+        query_issues(list(self.issue_registry.values()), issue_store, self.issue_executor, refresh_issues)
+        if issue_store:
+            if refresh_issues:
+                # only once for all job groups as it waits for all queries
+                update_issue_store(issue_store, self.issue_registry.values())
+            issue_store.close()
+
+    def _drop_unreferenced_issues(self):
+        """Remove issues reused from a previous report which are not referenced anymore from the issue registry."""
+        # notes instead of product reports do not reference issues
+        referenced = set(id(bug) for pr in self.report.values() for bug in getattr(pr, 'bugs', []))
+        for key in [key for key, issue in iteritems(self.issue_registry) if id(issue) not in referenced]:
+            del self.issue_registry[key]
+
+    def _reusable_reports(self):
+        """Return the states of all job groups and the reports recorded in the state file of those with unchanged state, see 'group_state'."""
+        if not self.state_file:
+            return {}, {}
+        recorded = load_state(self.state_file)
+        states = {k: group_state(self.browser, v, self.args) for k, v in iteritems(self.job_groups)}
+        reusable = {k: recorded[v][1] for k, v in iteritems(self.job_groups) if states[k] and recorded.get(v, (None,))[0] == states[k]}
+        log.info("Reusing reports of unchanged job groups: %s" % ', '.join(map(str, reusable.keys())))
+        return states, reusable
+
+    def _one_report(self, job_group_url, future=None, recorded=None):
         # for each job group on openqa.opensuse.org
-        try:
-            return ProductReport(self.browser, job_group_url, self.root_url, self.args)
-        except NotEnoughBuildsError as e:
-            log.debug("Catched 'not enough builds': %s" % e)
-            return "Not enough finished builds found"
+        if not (recorded or future and future.done()) and self.browser.deadline and time.time() >= self.browser.deadline:
+            # outstanding job groups are skipped, the ones already processing in worker processes are stopped by their browsers
+            if future:
+                future.cancel()
+            log.warning("Skipping job group %s, deadline exceeded" % job_group_url)
+            return unfinished_note('deadline exceeded before processing')
+        if not (future or recorded):
+            return product_report(self.browser, job_group_url, self.root_url, self.args, self.progress_browser, self.bugzilla_browser, self.issue_registry,
+                                  self.results_cache)
+        pr = recorded or future.result()
+        if isinstance(pr, ProductReport):
+            pr.adopt(self.args, self.browser, self.progress_browser, self.bugzilla_browser, self.issue_registry)
+        return pr
+
+    def close(self):
+        """Close the browsers of the report, see 'Browser.close', and shut down its own issue executor."""
+        for browser in (self.browser, self.progress_browser, self.bugzilla_browser):
+            if browser:
+                browser.close()
+        if self._own_issue_executor:
+            self.issue_executor.shutdown(wait=False)
 
     def _next_label(self):
         return '%s %i%%' % (self._label, self._progress * 100 / len(self.job_groups.keys()))
 
+    def stream(self):
+        """Yield the name and report of each job group as soon as it is processed, see 'stream' of the constructor."""
+        for k in self._processing:
+            yield k, self.report[k]
+
     def __str__(self):
         """Generate markdown."""
-        report_str = ""
-        for k, v in iteritems(self.report):
-            report_str += '# %s\n\n%s\n---\n' % (k, v)
-        return report_str
+        return ''.join(report_section(k, v) for k, v in iteritems(self.report))
+
+
+def get_root_url(args):
+    """Return the root URL of the openQA host to review."""
+    if args.job_group_urls:
+        return urljoin('/'.join(args.job_group_urls.split("/")[0:3]), '/')
+    return urljoin(args.host, '/')
 
 
-def generate_report(args):
+def generate_report(args, stream=False, browser=None, progress_browser=None, bugzilla_browser=None, issue_executor=None, issue_registry=None):
+    """Return 'Report' of all selected job groups, see 'Report' for 'stream' and 'issue_registry'.
+
+    Browsers can be passed to reuse their connections and cached content,
+    e.g. for repeated reports, otherwise they are created, the same for the
+    'issue_executor'.
+    """
     verbose_to_log = {
         0: logging.CRITICAL,
         1: logging.ERROR,
@@ -1116,24 +2154,34 @@ def generate_report(args):
     log.debug("args: %s" % args)
     args.output_state_results = True if args.verbose > 1 else args.output_state_results
 
-    if args.job_group_urls:
-        root_url = urljoin('/'.join(args.job_group_urls.split("/")[0:3]), '/')
-    else:
-        root_url = urljoin(args.host, '/')
-
-    browser = Browser(args, root_url)
+    # the deadline is read from the options by all browsers, also within worker processes
+    args.deadline_at = time.time() + args.deadline if hasattr(args, 'deadline') and args.deadline else None
+    root_url = get_root_url(args)
+    browser = browser or Browser(args, root_url, max_connections=max_connections(args, root_url))
+    # all browsers share the job store, old jobs are only removed once per report
+    browser.gc_job_store()
     job_groups = get_job_groups(browser, root_url, args)
     assert not (args.builds and len(job_groups) > 1), "builds option and multiple job groups not supported"
     assert len(job_groups) > 0, "No job groups were found, maybe misspecified '--job-groups'?"
 
-    return Report(browser, args, root_url, job_groups)
+    report = Report(browser, args, root_url, job_groups, stream, progress_browser, bugzilla_browser, issue_executor, issue_registry)
+    log.info("In-memory cache: %s" % browser.cache)
+    return report
+
 
+def load_config(required=True):
+    """Read the configuration file, exit if it is missing but 'required', e.g. for issue retrieval credentials.
 
-def load_config():
+    An optional configuration is still read if present, e.g. for the limits
+    of '--max-connections' per host.
+    """
     global config
     config = ConfigParser()
     config_entries = config.read(CONFIG_PATH)
-    if not config_entries:  # pragma: no cover
+    if not config_entries:
+        if not required:
+            config = None
+            return
         print("Need configuration file '{}' for issue retrieval credentials".format(CONFIG_PATH))
         print(CONFIG_USAGE)
         sys.exit(1)
@@ -1144,18 +2192,123 @@ ie_filters = {
     "unassigned": lambda ie: ie.bug and ie.bug.queried and ie.bug.is_open and not ie.bug.is_assigned
 }
 
+# filters of 'ie_filters' only keeping entries which reference an issue
+issue_only_filters = ['closed', 'unassigned']
+
+
+def output_filters(args):
+    """Return the names of the filters applied to each requested output, the one of '--filter' together with the one of each '--output'."""
+    outputs = args.output if hasattr(args, 'output') and args.output else [(None, None, None)]
+    common = args.filter if hasattr(args, 'filter') else None
+    return [[iefilter for iefilter in (common, output_filter) if iefilter] for _, output_filter, _ in outputs]
+
+
+def only_issue_entries(args):
+    """Return True if all requested reports only show entries referencing an issue, see 'issue_only_filters'."""
+    return all(any(iefilter in issue_only_filters for iefilter in filters) for filters in output_filters(args))
+
+
+def kept_by_outputs(ie, args):
+    """Return True if the issue entry 'ie' is shown by any requested report, see 'output_filters'.
+
+    The status of the referenced issue, if any, is waited for.
+    """
+    return any(all(ie_filters[iefilter](ie) for iefilter in filters) for filters in output_filters(args))
+
+
+def filter_product_report(pr, iefilter):
+    for arch, ar in iteritems(pr.reports):
+        for issue_status, issue_types in iteritems(ar.issues):
+            for issue_type, ies in iteritems(issue_types):
+                issue_types[issue_type] = [ie for ie in ies if iefilter(ie)]
+    pr.reports = SortedDict({a: ar for a, ar in iteritems(pr.reports) if ar.total_issues > 0})
+
 
 def filter_report(report, iefilter):
     report.report = SortedDict({p: pr for p, pr in iteritems(report.report) if isinstance(pr, ProductReport)})
     for product, pr in iteritems(report.report):
-        for arch, ar in iteritems(pr.reports):
-            for issue_status, issue_types in iteritems(ar.issues):
-                for issue_type, ies in iteritems(issue_types):
-                    issue_types[issue_type] = [ie for ie in ies if iefilter(ie)]
-        pr.reports = SortedDict({a: ar for a, ar in iteritems(pr.reports) if ar.total_issues > 0})
+        filter_product_report(pr, iefilter)
     report.report = SortedDict({p: pr for p, pr in iteritems(report.report) if pr.reports})
 
 
+def _copy_arch_report(ar):
+    ar = copy.copy(ar)
+    ar.issues = defaultdict(_issue_types, {
+        issue_status: defaultdict(list, {issue_type: list(ies) for issue_type, ies in iteritems(issue_types)})
+        for issue_status, issue_types in iteritems(ar.issues)})
+    return ar
+
+
+def _copy_product_report(pr):
+    if not isinstance(pr, ProductReport):
+        return pr
+    pr = copy.copy(pr)
+    pr.reports = SortedDict({arch: _copy_arch_report(ar) for arch, ar in iteritems(pr.reports)})
+    return pr
+
+
+def filtered_report(report, iefilter):
+    """Return a copy of 'report' filtered like 'filter_report' does, leaving 'report' itself unchanged."""
+    filtered = copy.copy(report)
+    filtered.report = SortedDict({product: _copy_product_report(pr) for product, pr in iteritems(report.report)})
+    filter_report(filtered, iefilter)
+    return filtered
+
+
+def render_report(report, output_format='md'):
+    """Return 'report' rendered as 'output_format'."""
+    content = str(report)
+    return markdown.markdown(content) if output_format == 'html' else content
+
+
+def write_output(report, output_format, iefilter, path):
+    """Write 'report' rendered as 'output_format' to 'path' or stdout for '-', only including issue entries matching the filter named 'iefilter'."""
+    if iefilter:
+        report = filtered_report(report, ie_filters[iefilter])
+    content = render_report(report, output_format)
+    if path == '-':
+        print(content)
+        return
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def render_section(product, pr, output_format='md', iefilters=None):
+    """Return the section of the job group 'product' with report 'pr' rendered as 'output_format'.
+
+    Only issue entries matching all filters named in 'iefilters' are included
+    and an empty string is returned if none is left, like 'filter_report'.
+    """
+    for iefilter in iefilters or []:
+        if not isinstance(pr, ProductReport):
+            return ''
+        pr = _copy_product_report(pr)
+        filter_product_report(pr, ie_filters[iefilter])
+        if not pr.reports:
+            return ''
+    content = report_section(product, pr)
+    return markdown.markdown(content) if output_format == 'html' else content
+
+
+def stream_outputs(report, outputs, iefilter=None):
+    """Write the section of each job group of a streaming 'report' to all 'outputs' as soon as it is processed.
+
+    'outputs' is a list of tuples as returned by 'output_spec', 'iefilter'
+    the name of a filter applied to all outputs.
+    """
+    files = [(output_format, [f for f in (iefilter, output_filter) if f], sys.stdout if path == '-' else open(path, 'w'))
+             for output_format, output_filter, path in outputs]
+    try:
+        for product, pr in report.stream():
+            for output_format, iefilters, f in files:
+                f.write(render_section(product, pr, output_format, iefilters))
+                f.flush()
+    finally:
+        for _, _, f in files:
+            if f is not sys.stdout:
+                f.close()
+
+
 def reminder_comment_on_issue(ie, min_days_unchanged=MIN_DAYS_UNCHANGED):
     issue = ie.bug
     if issue.error:
@@ -1166,9 +2319,21 @@ def reminder_comment_on_issue(ie, min_days_unchanged=MIN_DAYS_UNCHANGED):
         issue.add_comment(comment)
 
 
+def _query_last_comments(report):
+    """Schedule retrieving the last comment of all bugzilla bugs of 'report' on its issue executor, if any."""
+    if not report.issue_executor:
+        return
+    # the comments of all bugs are retrieved concurrently, reminders are posted one by one
+    for issue in OrderedDict((id(ie.bug), ie.bug) for pr in report.report.values() for ar in pr.reports.values()
+                             for issue_types in ar.issues.values() for ies in issue_types.values() for ie in ies if ie.bug).values():
+        if not issue.error and issue.issue_type == 'bugzilla':
+            issue.query_last_comment(report.issue_executor)
+
+
 def reminder_comment_on_issues(report, min_days_unchanged=MIN_DAYS_UNCHANGED):
     processed_issues = set()
     report.report = SortedDict({p: pr for p, pr in iteritems(report.report) if isinstance(pr, ProductReport)})
+    _query_last_comments(report)
     for product, pr in iteritems(report.report):
         for arch, ar in iteritems(pr.reports):
             for issue_status, issue_types in iteritems(ar.issues):
@@ -1176,11 +2341,12 @@ def reminder_comment_on_issues(report, min_days_unchanged=MIN_DAYS_UNCHANGED):
                     for ie in ies:
                         issue = ie.bug
                         if issue:
-                            bugref = issue.bugref.replace('bnc', 'bsc').replace('boo', 'bsc')
+                            bugref = normalize_bugref(issue.bugref)
                             if bugref not in processed_issues:
                                 try:
                                     reminder_comment_on_issue(ie, min_days_unchanged)
-                                except HTTPError as e:  # pragma: no cover
+                                # e.g. after the deadline no more requests are issued, see '--deadline'
+                                except (HTTPError, DownloadError) as e:
                                     log.error("Encountered error trying to post a reminder comment on issue '%s': %s. Skipping." % (ie, e))
                                     continue
                                 processed_issues.add(bugref)
@@ -1188,22 +2354,29 @@ def reminder_comment_on_issues(report, min_days_unchanged=MIN_DAYS_UNCHANGED):
 
 def main():  # pragma: no cover, only interactive
     args = parse_args()
-    if args.query_issue_status or args.report_links:
-        load_config()
-    report = generate_report(args)
+    load_config(required=args.query_issue_status or args.report_links)
+    report = generate_report(args, stream=args.stream)
+    try:
+        if args.stream:
+            stream_outputs(report, args.output or [('md', None, '-')], args.filter)
+            if args.reminder_comment_on_issues:
+                reminder_comment_on_issues(report)
+            return
 
-    if args.reminder_comment_on_issues:
-        reminder_comment_on_issues(report)
+        if args.reminder_comment_on_issues:
+            reminder_comment_on_issues(report)
 
-    if args.filter:
-        try:
+        if args.filter:
             filter_report(report, ie_filters[args.filter])
-        except KeyError:
-            print("No such filter '%s'" % args.filter)
-            print("Available filters: %s" % ', '.join(ie_filters.keys()))
-            sys.exit(1)
 
-    print(report)
+        if not args.output:
+            print(report)
+        # all outputs are rendered from the same report, each with its own filter
+        for output_format, iefilter, path in args.output or []:
+            write_output(report, output_format, iefilter, path)
+    finally:
+        # e.g. access times of cache entries are only written when closing
+        report.close()
 
 
 if __name__ == "__main__":
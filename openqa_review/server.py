@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+
+"""
+Serve openQA review reports over HTTP from a long-running process.
+
+Instead of starting 'openqa-review' from scratch for every report, e.g. from
+cron, the server keeps the browsers including their connections and in-memory
+caches between reports and refreshes the report in the background every
+'--refresh-interval' seconds. Content which can not change anymore, e.g. of
+finished jobs, is retrieved only once, everything else is retrieved again on
+each refresh, see '--cache-ttl'. The status of issues is also kept and only
+queried again after the time to live of the ticket URL, e.g. with
+'--cache-ttl progress.opensuse.org=3600'. Combine with '--issue-store' to
+only query the status of issues which changed since the last refresh.
+
+The most recent report is served as
+
+ - '/' or '/report.md': markdown
+ - '/report.html': HTML, needs the python module 'markdown'
+ - '/report.json': job groups, architectures and issues as JSON
+
+each optionally limited with '?filter=FILTER' to issue entries matching one of
+the filters of '--filter'. A filter selected with '--filter' is applied to
+all responses. Before the first report is ready requests are answered with
+'503 Service Unavailable'.
+
+All options of 'openqa-review' are supported, e.g.:
+
+    openqa-review-serve --host https://openqa.opensuse.org --job-groups 'openSUSE Tumbleweed' --port 8080
+"""
+
+# Python 2 and 3: easiest option
+# see http://python-future.org/compatible_idioms.html
+from __future__ import absolute_import
+from future.standard_library import install_aliases  # isort:skip to keep 'install_aliases()'
+install_aliases()
+from future.utils import iteritems
+
+import json
+import logging
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+from openqa_review import openqa_review
+from openqa_review.browser import Browser
+
+logging.basicConfig()
+log = logging.getLogger(sys.argv[0] if __name__ == "__main__" else __name__)
+
+CONTENT_TYPES = {
+    'md': 'text/markdown; charset=utf-8',
+    'html': 'text/html; charset=utf-8',
+    'json': 'application/json',
+}
+
+
+def _issue_json(ie):
+    return {
+        'failures': [f['name'] for f in ie.failures],
+        'bugref': ie.bug.bugref if ie.bug else None,
+        'status': ie.bug.status if ie.bug and ie.bug.queried else None,
+    }
+
+
+def report_json(report):
+    """Return the job groups of 'report' with their architectures and issue entries as JSON serializable structure."""
+    groups = []
+    for product, pr in iteritems(report.report):
+        if not isinstance(pr, openqa_review.ProductReport):
+            groups.append({'name': product, 'error': str(pr).strip()})
+            continue
+        groups.append({
+            'name': product,
+            'build': pr.build,
+            'reference_build': pr.ref_build,
+            'missing_archs': pr.missing_archs,
+            'archs': {arch: {
+                'status': ar.status_badge,
+                'issues': {issue_status: {issue_type: [_issue_json(ie) for ie in ies] for issue_type, ies in iteritems(issue_types) if ies}
+                           for issue_status, issue_types in iteritems(ar.issues)},
+            } for arch, ar in iteritems(pr.reports)},
+        })
+    return {'groups': groups}
+
+
+class ReportServer(object):
+
+    """Keep the report of the job groups selected by 'args' up to date and rendered."""
+
+    def __init__(self, args):
+        """Create report server, the first report is only generated on 'refresh'."""
+        # the output is selected by each request, see 'openqa_review.only_issue_entries'
+        args.output = None
+        self.args = args
+        root_url = openqa_review.get_root_url(args)
+        self.browser = Browser(args, root_url, max_connections=openqa_review.max_connections(args, root_url))
+        self.progress_browser = openqa_review.progress_browser_factory(args) if args.query_issue_status else None
+        self.bugzilla_browser = openqa_review.bugzilla_browser_factory(args) if args.query_issue_status else None
+        self.issue_executor = openqa_review.issue_executor_factory(self.progress_browser, self.bugzilla_browser) if args.query_issue_status else None
+        # issues of the served report, each refresh reuses copies of the fresh ones without touching the ones still served
+        self.issue_registry = {}
+        self.report = None
+        self.generated = None
+        self._rendered = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Generate a new report reusing the browsers and fresh issues of the previous one, content which can still change is retrieved again."""
+        started = time.time()
+        for browser in (self.browser, self.progress_browser, self.bugzilla_browser):
+            if browser:
+                browser.expire()
+        report = openqa_review.generate_report(self.args, browser=self.browser, progress_browser=self.progress_browser,
+                                               bugzilla_browser=self.bugzilla_browser, issue_executor=self.issue_executor,
+                                               issue_registry=self.issue_registry)
+        with self._lock:
+            self.report, self.issue_registry, self.generated, self._rendered = report, report.issue_registry, time.time(), {}
+        log.info("Refreshed report in %.1f s" % (self.generated - started))
+
+    def close(self):
+        """Close the browsers, see 'Browser.close', and shut down the issue executor."""
+        for browser in (self.browser, self.progress_browser, self.bugzilla_browser):
+            if browser:
+                browser.close()
+        if self.issue_executor:
+            self.issue_executor.shutdown(wait=False)
+
+    def render(self, output_format='md', iefilter=None):
+        """Return the current report rendered as 'output_format' with issue entries matching '--filter' and the filter named 'iefilter', None without report."""
+        with self._lock:
+            report, rendered = self.report, self._rendered
+        if report is None:
+            return None
+        key = (output_format, iefilter)
+        if key not in rendered:
+            # the report is built for the filter of '--filter', see 'openqa_review.only_issue_entries'
+            for name in openqa_review.output_filters(self.args)[0] + ([iefilter] if iefilter else []):
+                report = openqa_review.filtered_report(report, openqa_review.ie_filters[name])
+            if output_format == 'json':
+                rendered[key] = json.dumps(report_json(report), indent=2, sort_keys=True)
+            else:
+                rendered[key] = openqa_review.render_report(report, output_format)
+        return rendered[key]
+
+    def run_refresh(self, interval):  # pragma: no cover, only interactive
+        """Refresh the report every 'interval' seconds, errors are logged and retried on the next refresh."""
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                log.error("Could not refresh report: %s" % e)
+            time.sleep(interval)
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+
+    """Answer requests for the report of 'server.report_server'."""
+
+    paths = {'/': 'md', '/report.md': 'md', '/report.html': 'html', '/report.json': 'json'}
+
+    def do_GET(self):  # noqa: N802 name defined by BaseHTTPRequestHandler
+        """Serve the current report in the format selected by the path."""
+        url = urlparse(self.path)
+        output_format = self.paths.get(url.path)
+        if not output_format:
+            return self._respond(404, 'text/plain', "Not found, choose from %s\n" % ', '.join(sorted(self.paths.keys())))
+        iefilter = parse_qs(url.query).get('filter', [None])[0]
+        if iefilter and iefilter not in openqa_review.ie_filters:
+            return self._respond(400, 'text/plain', "Invalid filter '%s', choose from %s\n" % (iefilter, ', '.join(sorted(openqa_review.ie_filters.keys()))))
+        if output_format == 'html' and not openqa_review.markdown_available:  # pragma: no cover
+            return self._respond(501, 'text/plain', "HTML output needs the python module 'markdown'\n")
+        content = self.server.report_server.render(output_format, iefilter)
+        if content is None:
+            return self._respond(503, 'text/plain', "Report not generated yet, retry later\n", {'Retry-After': '30'})
+        self._respond(200, CONTENT_TYPES[output_format], content)
+
+    def _respond(self, code, content_type, content, headers=None):
+        body = content.encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in iteritems(headers or {}):
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Log requests with the module logger instead of stderr."""
+        log.info("%s - %s" % (self.address_string(), format % args))
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+
+    """HTTP server answering each request in its own thread."""
+
+    daemon_threads = True
+
+
+def create_server(report_server, bind='', port=0):
+    """Return HTTP server serving the report of 'report_server' on 'bind':'port'."""
+    server = ThreadingHTTPServer((bind, port), ReportRequestHandler)
+    server.report_server = report_server
+    return server
+
+
+def create_parser():
+    parser = openqa_review.create_parser()
+    parser.description = __doc__
+    parser.add_argument('--bind', default='',
+                        help="Address to listen on, all interfaces by default")
+    parser.add_argument('--port', type=int, default=8080,
+                        help="Port to listen on")
+    parser.add_argument('--refresh-interval', type=float, default=600,
+                        help="Seconds to wait after generating a report before generating the next one")
+    return parser
+
+
+def main():  # pragma: no cover, only interactive
+    args = openqa_review.parse_args(create_parser())
+    openqa_review.load_config(required=args.query_issue_status or args.report_links)
+    report_server = ReportServer(args)
+    refresh_thread = threading.Thread(target=report_server.run_refresh, args=(args.refresh_interval,))
+    refresh_thread.daemon = True
+    refresh_thread.start()
+    server = create_server(report_server, args.bind, args.port)
+    log.info("Serving reports on %s:%i" % server.server_address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        report_server.close()
+
+
+if __name__ == "__main__":
+    main()
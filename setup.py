@@ -31,6 +31,8 @@ setup(
         # there is also a new version 'configparser2' to resolve the name ambuigity but that package might not be available everywhere
         "configparser",
         "future",
+        # backport of 'concurrent.futures' for python 2
+        "futures; python_version < '3.0'",
         "sortedcontainers",
         "humanfriendly",
         "requests",
@@ -57,6 +59,8 @@ setup(
     ],
     entry_points={
         'console_scripts': ['openqa-review=openqa_review.openqa_review:main',
+                            'openqa-review-cache=openqa_review.cache:main',
+                            'openqa-review-serve=openqa_review.server:main',
                             'tumblesle-release=openqa_review.tumblesle_release:main'],
     },
     scripts=['bin/openqa-review-sles-ha', 'bin/openqa-review-daily-email'],
@@ -8,23 +8,32 @@ isort:skip_file
 
 # see http://python-future.org/compatible_idioms.html
 from future.standard_library import install_aliases  # isort:skip to keep 'install_aliases()'
-from future.utils import iteritems
+from future.utils import iteritems, itervalues
 
 install_aliases()
 import contextlib
+import json
+import multiprocessing
 import os.path
+import pickle
 import re
 import shutil
 import sys
 import tempfile
+import threading
+import time
 from argparse import Namespace
-from openqa_review.browser import filename_to_url
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from openqa_review.browser import DeadlineExceededError, filename_to_url
+from openqa_review.cache import HTTPCache, IssueStore, JobStore, SQLiteStore, import_directory, open_store
 from urllib.parse import urljoin, urlparse
 from configparser import ConfigParser  # isort:skip can not make isort happy here
 
 import pytest
+import requests
+from sortedcontainers import SortedDict
 
-from openqa_review import openqa_review  # SUT
+from openqa_review import openqa_review, server  # SUT
 
 
 def args_factory():
@@ -103,6 +112,15 @@ def test_args_implicit():
     assert not args.bugrefs
 
 
+def test_invalid_cache_ttls_are_usage_errors():
+    sys.argv[1:] = ['--cache-ttl', '/tests/overview=60', '--cache-ttl', 'jsonrpc=never']
+    assert openqa_review.parse_args().cache_ttl == ['/tests/overview=60', 'jsonrpc=never']
+    for ttl in ['foo=abc', 'foo', '(=60']:
+        with pytest.raises(SystemExit):
+            sys.argv[1:] = ['--cache-ttl', ttl]
+            openqa_review.parse_args()
+
+
 def cache_test_args_factory():
     args = args_factory()
     args.job_group_urls = args.host + '/group_overview/25'
@@ -351,6 +369,234 @@ def test_filename_to_url_encodes_valid_url():
     assert url_object.netloc == 'openqa.opensuse.org'
 
 
+def test_browser_get_many_yields_same_content_as_single_requests():
+    args = cache_test_args_factory()
+    args.max_connections = 3
+    browser = browser_factory(args)
+    urls = ['/tests/overview?distri=opensuse&version=42.1&build=0313&groupid=25',
+            '/tests/overview?distri=opensuse&version=42.1&build=0311&groupid=25',
+            '/tests/overview?distri=opensuse&version=42.1&build=0313&groupid=25']
+    pages = browser.get_many(urls)
+    assert pages == [browser.get_page(url) for url in urls]
+    soups = browser.get_soup_many(urls[:2])
+    assert [s.find(id='summary') is not None for s in soups] == [True, True]
+    group = browser.get_many([args.job_group_urls + '.json'], as_json=True)[0]
+    assert group['group']['id'] == 25
+    with pytest.raises(openqa_review.DownloadError):
+        browser.get_many(urls + ['/tests/overview?build=does_not_exist'])
+
+
+def test_browser_reuses_one_session_per_host():
+    args = cache_test_args_factory()
+    args.max_connections = 2
+    browser = browser_factory(args)
+    session = browser.session('https://openqa.opensuse.org/tests/1')
+    assert session is browser.session('https://openqa.opensuse.org/api/v1/jobs')
+    assert session is not browser.session('https://bugzilla.opensuse.org/jsonrpc.cgi')
+    assert session.headers['Connection'] == 'keep-alive'
+    assert 'gzip' in session.headers['Accept-Encoding']
+    assert session.get_adapter('https://openqa.opensuse.org')._pool_maxsize == 2
+
+
+def test_http_cache_serves_fresh_entries_and_revalidates_expired():
+    with TemporaryDirectory() as tmp_dir:
+        cache = HTTPCache(open_store(os.path.join(tmp_dir, 'cache')), [('/api/v1/jobs', 60)])
+        assert cache.get('/tests/123') is None
+        assert cache.ttl('/tests/123') is None
+        assert cache.ttl('/api/v1/jobs?build=0313') == 60
+        assert cache.ttl('/group_overview/25.json') == 300
+        entry = cache.put('/api/v1/jobs?build=0313', '{"jobs": []}', {'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2018 00:00:00 GMT'}, now=1000)
+        assert cache.is_fresh('/api/v1/jobs?build=0313', entry, now=1059)
+        assert not cache.is_fresh('/api/v1/jobs?build=0313', entry, now=1060)
+        assert cache.validators(entry) == {'If-None-Match': '"abc"', 'If-Modified-Since': 'Mon, 01 Jan 2018 00:00:00 GMT'}
+        assert cache.validators(None) == {}
+        entry = cache.refresh('/api/v1/jobs?build=0313', cache.get('/api/v1/jobs?build=0313'), {'ETag': '"def"'}, now=2000)
+        assert entry['fetched'] == 2000
+        assert cache.validators(entry)['If-None-Match'] == '"def"'
+
+        args = args_factory()
+        args.cache_dir = os.path.join(tmp_dir, 'cache')
+        args.cache_ttl = ['/api/v1/jobs=never']
+        cache.put('https://openqa.opensuse.org/api/v1/jobs?build=0313', '{"jobs": [{"id": 1}]}')
+        browser = browser_factory(args)
+        assert browser.get_json('/api/v1/jobs?build=0313') == {'jobs': [{'id': 1}]}
+        # entries are kept per host
+        cache.put('https://openqa.example.com/api/v1/jobs?build=0313', '{"jobs": []}')
+        assert openqa_review.Browser(args, 'https://openqa.example.com/').get_json('/api/v1/jobs?build=0313') == {'jobs': []}
+
+
+def test_sqlite_store_evicts_least_recently_used_entries():
+    with TemporaryDirectory() as tmp_dir:
+        store = SQLiteStore(os.path.join(tmp_dir, 'cache.sqlite'))
+        assert store.get('/tests/1') is None
+        for i in range(1, 4):
+            store.put('/tests/%i' % i, 'content of job %i ' % i * 100)
+        assert store.get('/tests/1') == 'content of job 1 ' * 100
+        assert store.urls() == ['/tests/1', '/tests/2', '/tests/3']
+        store.evict(store.size() - 1)
+        # job 2 was accessed least recently
+        assert store.urls() == ['/tests/1', '/tests/3']
+        store.gc(max_age=0)
+        assert store.urls() == []
+        store.close()
+
+
+def test_sqlite_store_tracks_its_size_for_max_size():
+    with TemporaryDirectory() as tmp_dir:
+        store = SQLiteStore(os.path.join(tmp_dir, 'cache.sqlite'), max_size=10 ** 6)
+        statements = []
+        store._db.set_trace_callback(statements.append)
+        for i in range(1, 4):
+            store.put('/tests/%i' % i, 'content of job %i ' % i * 100)
+        store.put('/tests/1', 'new content of job 1')
+        # the size of all entries is only summed up once
+        assert len([s for s in statements if 'SUM(size)' in s]) == 1
+        assert store._size == store.size()
+        store.max_size = store.size()
+        store.put('/tests/4', 'content of job 4 ' * 100)
+        # job 2 was stored least recently
+        assert '/tests/2' not in store.urls() and '/tests/4' in store.urls()
+        assert store._size == store.size() <= store.max_size
+        store.close()
+
+
+def test_browser_close_writes_access_times_of_loaded_entries():
+    args = cache_test_args_factory()
+    with TemporaryDirectory() as tmp_dir:
+        store = open_store(tmp_dir, 'sqlite')
+        import_directory(store, args.load_dir)
+        store._db.execute("UPDATE entries SET atime = 0")
+        store.close()
+        args.load_dir = tmp_dir
+        args.cache_backend = 'sqlite'
+        report = openqa_review.generate_report(args)
+        report.close()
+        store = open_store(tmp_dir, 'sqlite')
+        accessed = store._db.execute("SELECT COUNT(*) FROM entries WHERE atime > 0").fetchone()[0]
+        store.close()
+    assert accessed > 0
+
+
+def test_saved_pages_can_be_imported_and_loaded_from_sqlite_store():
+    args = cache_test_args_factory()
+    with TemporaryDirectory() as tmp_dir:
+        store = open_store(tmp_dir, 'sqlite')
+        assert import_directory(store, args.load_dir) > 0
+        store.close()
+        args.load_dir = tmp_dir
+        args.cache_backend = 'sqlite'
+        compare_report(openqa_review.generate_report(args), os.path.join(os.path.dirname(os.path.realpath(__file__)), 'report25_TTT.md'))
+
+        args.load = False
+        args.save = True
+        args.save_dir = os.path.join(tmp_dir, 'saved')
+        args.cache_max_size = 10 ** 6
+        browser = browser_factory(args)
+        browser.load_store = open_store(tmp_dir, 'sqlite')
+        browser.load = True
+        browser.get_json(args.job_group_urls + '.json')
+        assert open_store(args.save_dir, 'sqlite').urls() == [args.job_group_urls + '.json']
+
+
+def test_browser_memory_cache_keeps_decoded_content():
+    args = cache_test_args_factory()
+    args.memory_cache_size = 10 ** 6
+    args.cache_parsed = True
+    browser = browser_factory(args)
+    group_url = args.job_group_urls + '.json'
+    group = browser.get_json(group_url)
+    assert browser.get_json(group_url) == group
+    # changes of returned content do not affect later readers
+    group.clear()
+    assert browser.get_json(group_url)
+    assert browser.get_page(group_url).startswith('{')
+    overview_url = '/tests/overview?distri=opensuse&version=42.1&build=0313&groupid=25'
+    soup = browser.get_soup(overview_url)
+    assert browser.get_soup_many([overview_url]) == [soup]
+    assert browser.get_soup(overview_url) is soup
+    assert browser.cache.hits == 5
+    assert browser.cache.size <= args.memory_cache_size
+    report = str(openqa_review.generate_report(args))
+    assert '**Common issues:**' in report
+
+
+def test_overview_pages_are_extracted_identically_with_and_without_lxml(monkeypatch):
+    args = cache_test_args_factory()
+    browser = browser_factory(args)
+    page = browser.get_page('/tests/overview?distri=opensuse&version=42.1&build=0313&groupid=25')
+    details = openqa_review.parse_overview(page, use_lxml=False)
+    assert details.summary == {'passed': 33, 'soft failure': 5, 'failed': 9}
+    assert details.archs == {'x86_64'}
+    assert details.results['res_Gnome-DVD_x86_64_RAID10'] == {
+        'id': 'res_Gnome-DVD_x86_64_RAID10', 'status': 'result_failed', 'href': '/tests/169785',
+        'failedmodules': [{'href': '/tests/169785/modules/bootloader/steps/2', 'name': 'bootloader', 'needles': ['bootmenu-20141112']}]}
+    if openqa_review.lxml_available:
+        assert openqa_review.parse_overview(page, use_lxml=True).__dict__ == details.__dict__
+    monkeypatch.setattr(openqa_review, 'lxml_available', False)
+    compare_report(openqa_review.generate_report(args), os.path.join(os.path.dirname(os.path.realpath(__file__)), 'report25_TTT.md'))
+
+
+def test_overview_can_be_built_from_jobs_api():
+    def job(job_id, test, machine, result, modules=(), state='done'):
+        return {'id': job_id, 'state': state, 'result': result,
+                'settings': {'FLAVOR': 'DVD', 'ARCH': 'x86_64', 'MACHINE': machine, 'TEST': test},
+                'modules': [{'name': m, 'result': 'failed'} for m in modules]}
+    overview_url = '/tests/overview?distri=opensuse&version=42.1&build=0313&groupid=25'
+    pages = {
+        '/api/v1/jobs?distri=opensuse&version=42.1&build=0313&groupid=25&latest=1': {'jobs': [
+            job(1, 'RAID0', '64bit', 'passed'),
+            job(2, 'RAID1', '64bit', 'failed', ['bootloader']),
+            job(3, 'RAID1', 'uefi', 'softfailed'),
+            # details of unfinished jobs are not retrieved
+            job(4, 'RAID5', '64bit', 'none', ['bootloader'], state='running'),
+        ]},
+        '/api/v1/jobs/2/details': {'job': {'testresults': [
+            {'name': 'bootloader', 'result': 'failed', 'details': [
+                {'num': 1, 'result': 'ok'}, {'num': 2, 'result': 'fail', 'needles': [{'name': 'bootmenu-20141112'}]}]}]}},
+        '/api/v1/jobs/2/comments': [{'text': 'bsc#1234', 'bugrefs': ['bsc#1234']}, {'text': 'no bugref'}],
+        '/api/v1/jobs/3/comments': [{'text': 'see poo#42'}],
+        '/api/v1/jobs/4/comments': [],
+    }
+    with TemporaryDirectory() as tmp_dir:
+        store = open_store(tmp_dir)
+        for url, content in iteritems(pages):
+            store.put(url, json.dumps(content))
+        args = cache_test_args_factory()
+        args.load_dir = tmp_dir
+        browser = browser_factory(args)
+        details = openqa_review.api_overview(browser, overview_url, bugrefs=True)
+    assert details.summary == {'passed': 1, 'failed': 1, 'soft failure': 1, 'running': 1}
+    assert details.archs == {'x86_64'}
+    assert details.badges_total == 4
+    assert browser.finished_jobs == {'1', '2', '3'}
+    assert details.results['res_DVD_x86_64_RAID5']['failedmodules'] == [
+        {'href': '/tests/4/modules/bootloader/steps/1', 'name': 'bootloader', 'needles': []}]
+    assert details.results['res_DVD_x86_64_RAID1'] == {
+        'id': 'res_DVD_x86_64_RAID1', 'status': 'result_failed', 'href': '/tests/2',
+        'failedmodules': [{'href': '/tests/2/modules/bootloader/steps/2', 'name': 'bootloader', 'needles': ['bootmenu-20141112']}],
+        'bugref': 'bsc#1234', 'bugref_href': 'https://bugzilla.suse.com/show_bug.cgi?id=1234'}
+    assert details.results['res_DVD_x86_64_RAID1@uefi']['bugref'] == 'poo#42'
+    assert 'bugref' not in details.results['res_DVD_x86_64_RAID0']
+
+
+def test_jobs_api_overview_matches_overview_page():
+    # the API responses in 'api_data_source' are saved for the jobs shown on the overview pages of 'tests'
+    tests_dir = os.path.dirname(os.path.realpath(__file__))
+    args = cache_test_args_factory()
+    args.load_dir = os.path.join(tests_dir, 'api_data_source')
+    browser = browser_factory(args)
+    for build in ['0313', '0311']:
+        overview_url = '/tests/overview?distri=opensuse&version=42.1&build=%s&groupid=25' % build
+        page = openqa_review.parse_overview(open_store(tests_dir).get(overview_url))
+        details = openqa_review.api_overview(browser, overview_url)
+        assert details.archs == page.archs
+        shown = {}
+        for key, result in sorted(iteritems(page.results)):
+            shown.setdefault(result['href'], (key, result))
+        for key, result in itervalues(shown):
+            assert details.results[key] == result
+
+
 def test_single_job_group_pages_can_be_cached_from_cache():
     args = cache_test_args_factory()
     with TemporaryDirectory() as tmp_dir:
@@ -386,7 +632,7 @@ def bugrefs_test_args_factory():
     openqa_review.config.add_section('product_issues')
     openqa_review.config.set('product_issues', 'base_url', 'https://apibugzilla.suse.com')
     openqa_review.config.set('product_issues', 'username', 'user')
-    openqa_review.config.set('product_issues', 'password', 'pass')
+    openqa_review.config.set('product_issues', 'password', 'secret-password')
     openqa_review.config.set('product_issues', 'report_url', 'https://bugzilla.opensuse.org')
     openqa_review.config.add_section('product_issues:https://openqa.opensuse.org:product_mapping')
     openqa_review.config.set('product_issues:https://openqa.opensuse.org:product_mapping', '25', 'openSUSE Tumbleweed')
@@ -412,8 +658,32 @@ def test_bugrefs_are_used_for_triaging():
 def test_bugrefs_with_report_links():
     args = bugrefs_test_args_factory()
     args.report_links = True
-    report = str(openqa_review.generate_report(args))
-    compare_report(report, os.path.join(args.load_dir, 'report25_T_bugrefs.md'))
+    report = openqa_review.generate_report(args)
+    compare_report(str(report), os.path.join(args.load_dir, 'report25_T_bugrefs.md'))
+    # job pages are parsed only once for report links, also when rendering again
+    report.browser.get_page = None
+    compare_report(str(report), os.path.join(args.load_dir, 'report25_T_bugrefs.md'))
+
+
+def test_job_pages_are_parsed_once_per_arch_report(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.report_links = True
+    get_soup = openqa_review.Browser.get_soup
+    parsed = []
+
+    def get_soup_recording_url(browser, url):
+        parsed.append(url)
+        return get_soup(browser, url)
+    monkeypatch.setattr(openqa_review.Browser, 'get_soup', get_soup_recording_url)
+
+    def look_up_all_jobs(report, results):
+        # the soft fail lookup scraping the job pages also of the entries getting report links
+        for v in results.values():
+            openqa_review.parsed_page(report.test_browser, v['href'], report._parsed)
+    monkeypatch.setattr(openqa_review.ArchReport, '_search_for_bugrefs_for_softfailures', look_up_all_jobs)
+    report = openqa_review.generate_report(args)
+    compare_report(str(report), os.path.join(args.load_dir, 'report25_T_bugrefs.md'))
+    assert parsed and len(parsed) == len(set(parsed))
 
 
 def test_bugrefs_including_softfails():
@@ -447,6 +717,153 @@ def test_issue_status_can_be_queried_from_bugrefs():
     compare_report(report, os.path.join(args.load_dir, 'report25_bugrefs_build1508.md'))
 
 
+def json_rpc_get_url(method, params):
+    return requests.Request('GET', 'http://dummy/jsonrpc.cgi', params=SortedDict({'method': method, 'params': json.dumps([params])})).prepare().url.replace(
+        'http://dummy', '')
+
+
+def test_bugzilla_issues_are_queried_in_batches():
+    bug = {'id': 1, 'status': 'NEW', 'assigned_to': 'someone@suse.com', 'summary': 'Foo fails', 'priority': 'P2 - High'}
+    batch_url = json_rpc_get_url('Bug.get', {'ids': [1, 2], 'include_fields': openqa_review.BUGZILLA_FIELDS, 'permissive': True})
+    with TemporaryDirectory() as tmp_dir:
+        open_store(tmp_dir).put(batch_url, json.dumps({'result': {'bugs': [bug], 'faults': [{'id': 2}]}}))
+        args = cache_test_args_factory()
+        args.load_dir = tmp_dir
+        browser = browser_factory(args)
+        issues = [openqa_review.Issue(bugref, '', True, browser, browser, defer_query=True) for bugref in ['bsc#1', 'boo#1', 'bsc#2']]
+        assert all(issue.pending for issue in issues)
+        openqa_review.query_issues(issues)
+        # the request URL is too long for a file name but still stored under its URL
+        assert open_store(tmp_dir).urls() == [batch_url]
+    assert [issue.pending for issue in issues] == [False, False, False]
+    assert issues[0].queried and issues[1].queried
+    assert str(issues[1]) == '[boo#1]( "Foo fails") (Ticket status: NEW, prio: P2, assignee: someone@suse.com)'
+    # bugs missing in the batch response are queried individually
+    assert issues[2].error
+
+
+def test_issues_are_resolved_lazily_with_executor():
+    bug = {'id': 1, 'status': 'NEW', 'assigned_to': 'someone@suse.com', 'summary': 'Foo fails', 'priority': 'P2 - High'}
+    with TemporaryDirectory() as tmp_dir:
+        open_store(tmp_dir).put(json_rpc_get_url('Bug.get', {'ids': [1, 2, 3], 'include_fields': openqa_review.BUGZILLA_FIELDS, 'permissive': True}),
+                                json.dumps({'result': {'bugs': [bug, dict(bug, id=2, status='RESOLVED')], 'faults': [{'id': 3}]}}))
+        args = cache_test_args_factory()
+        args.load_dir = tmp_dir
+        browser = browser_factory(args)
+        issues = [openqa_review.Issue(bugref, '', True, browser, browser, defer_query=True) for bugref in ['bsc#1', 'bsc#2', 'bsc#3']]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            openqa_review.query_issues(issues, executor=executor)
+            assert issues[0].future is issues[1].future is issues[2].future
+            assert issues[0].is_open and not issues[1].is_open
+            assert issues[2].error
+    assert not any(issue.pending for issue in issues)
+
+
+def test_redmine_issues_are_queried_in_batches_following_pagination():
+    issue = {'id': 1, 'status': {'name': 'New'}, 'subject': 'Foo fails', 'priority': {'name': 'High'}, 'updated_on': '2016-09-01T10:00:00Z'}
+    url = 'https://progress.opensuse.org/issues.json?issue_id=1%2C2%2C3&status_id=%2A&limit=100&offset='
+    # the server might return less issues per page than requested
+    with TemporaryDirectory() as tmp_dir:
+        store = open_store(tmp_dir)
+        store.put(url + '0', json.dumps({'issues': [issue], 'total_count': 2, 'offset': 0, 'limit': 1}))
+        store.put(url + '1', json.dumps({'issues': [dict(issue, id=3, assigned_to={'name': 'Bob'})], 'total_count': 2, 'offset': 1, 'limit': 1}))
+        args = cache_test_args_factory()
+        args.load_dir = tmp_dir
+        browser = browser_factory(args)
+        issues = [openqa_review.Issue('poo#%i' % i, 'https://progress.opensuse.org/issues/%i' % i, True, browser, browser, defer_query=True) for i in [1, 2, 3]]
+        openqa_review.query_issues(issues)
+    assert [issue.pending for issue in issues] == [False, False, False]
+    assert issues[0].queried and issues[2].queried
+    assert issues[2].assignee == 'Bob'
+    # issues missing in the batch response are queried individually
+    assert issues[1].error
+
+
+def test_only_changed_issues_are_queried_with_issue_store():
+    bug = {'id': 1, 'status': 'NEW', 'assigned_to': 'someone@suse.com', 'summary': 'Foo fails', 'priority': 'P2 - High',
+           'last_change_time': '2016-08-01T10:00:00Z'}
+    poo = {'id': 4, 'status': {'name': 'New'}, 'subject': 'Bar fails', 'priority': {'name': 'High'}, 'updated_on': '2016-09-01T10:00:00Z'}
+    since = '2016-09-01T10:00:00Z'
+    with TemporaryDirectory() as tmp_dir:
+        issue_store = IssueStore(os.path.join(tmp_dir, 'issues.sqlite'))
+        issue_store.update([('bsc#1', bug), ('bsc#2', dict(bug, id=2)), ('poo#4', poo)], since)
+        store = open_store(tmp_dir)
+        store.put(json_rpc_get_url('Bug.search', {'id': [1, 2], 'last_change_time': since, 'include_fields': openqa_review.BUGZILLA_FIELDS}),
+                  json.dumps({'result': {'bugs': [dict(bug, id=2, status='RESOLVED', resolution='FIXED', last_change_time='2016-09-02T10:00:00Z')]}}))
+        store.put('https://progress.opensuse.org/issues.json?issue_id=4&status_id=%2A&updated_on=%3E%3D2016-09-01T10%3A00%3A00Z&limit=100&offset=0',
+                  json.dumps({'issues': [], 'total_count': 0}))
+        args = cache_test_args_factory()
+        args.load_dir = tmp_dir
+        browser = browser_factory(args)
+        issues = [openqa_review.Issue(bugref, 'https://progress.opensuse.org/issues/4' if bugref.startswith('poo') else '', True, browser, browser,
+                                      defer_query=True) for bugref in ['bsc#1', 'boo#2', 'bsc#3', 'poo#4']]
+        openqa_review.query_issues(issues, issue_store)
+        assert [issue.status for issue in issues] == ['NEW', 'RESOLVED', None, 'New']
+        # issues not in the store are queried as before
+        assert issues[2].error
+        assert issue_store.bugrefs() == ['bsc#1', 'bsc#2', 'poo#4']
+        assert issue_store.get('bsc#2')[0]['resolution'] == 'FIXED'
+        # the time of synchronization is the newest change known to each issue tracker, independent of the local clock
+        assert issue_store.get('bsc#1')[1] == issue_store.get('bsc#2')[1] == '2016-09-02T10:00:00Z'
+        assert issue_store.get('poo#4')[1] == since
+        issue_store.close()
+
+
+def test_issue_store_is_updated_without_waiting_for_scheduled_queries(monkeypatch):
+    bug = {'id': 1, 'status': 'NEW', 'assigned_to': 'someone@suse.com', 'summary': 'Foo fails', 'priority': 'P2 - High',
+           'last_change_time': '2016-09-01T10:00:00Z'}
+    released = threading.Event()
+
+    def query_chunk_when_released(chunk, query_batch=None):
+        released.wait(10)
+        for issue in chunk:
+            issue.query(bug)
+    monkeypatch.setattr(openqa_review, '_query_chunk', query_chunk_when_released)
+    with TemporaryDirectory() as tmp_dir:
+        issue_store = IssueStore(os.path.join(tmp_dir, 'issues.sqlite'))
+        browser = browser_factory()
+        issues = [openqa_review.Issue('bsc#1', '', True, browser, browser, defer_query=True)]
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            started = time.time()
+            openqa_review.query_issues(issues, issue_store, executor)
+            assert time.time() - started < 5
+            released.set()
+            openqa_review.update_issue_store(issue_store, issues)
+        assert issue_store.get('bsc#1') == (bug, '2016-09-01T10:00:00Z')
+        issue_store.close()
+
+
+def test_issues_are_taken_from_issue_store_as_is_when_loading():
+    bug = {'id': 1, 'status': 'NEW', 'assigned_to': 'someone@suse.com', 'summary': 'Foo fails', 'priority': 'P2 - High'}
+    since = '2016-09-01T10:00:00Z'
+    with TemporaryDirectory() as tmp_dir:
+        issue_store = IssueStore(os.path.join(tmp_dir, 'issues.sqlite'))
+        issue_store.update([('bsc#1', bug)], since)
+        args = cache_test_args_factory()
+        args.load_dir = tmp_dir
+        browser = browser_factory(args)
+        issues = [openqa_review.Issue('bsc#1', '', True, browser, browser, defer_query=True)]
+        # nothing is saved for querying changes since the last synchronization
+        openqa_review.query_issues(issues, issue_store, refresh=False)
+        assert issues[0].status == 'NEW'
+        assert not issues[0].error
+        assert issue_store.get('bsc#1')[1] == since
+        issue_store.close()
+
+
+def test_issues_are_shared_between_reports():
+    args = bugrefs_test_args_factory()
+    args.query_issue_status = True
+    report = openqa_review.generate_report(args)
+    pr = [pr for pr in report.report.values() if isinstance(pr, openqa_review.ProductReport)][0]
+    assert sorted(bug.bugref for bug in pr.bugs) == sorted(bug.bugref for bug in report.issue_registry.values())
+    again = openqa_review.ProductReport(report.browser, pr.job_group_url, report.root_url, args, report.progress_browser, report.bugzilla_browser,
+                                        issue_registry=report.issue_registry)
+    assert [id(bug) for bug in again.bugs] == [id(bug) for bug in pr.bugs]
+    assert openqa_review.normalize_bugref('boo#1') == openqa_review.normalize_bugref('bnc#1') == 'bsc#1'
+    assert openqa_review.normalize_bugref('poo#1') == 'poo#1'
+
+
 def test_reminder_comments_on_referenced_bugs_are_posted():
     args = bugrefs_test_args_factory()
     args.verbose_test = 1
@@ -462,6 +879,60 @@ def test_reminder_comments_on_referenced_bugs_are_posted():
     args.dry_run = False
 
 
+def test_last_comments_are_queried_on_the_issue_executor(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    args.dry_run = True
+    report = openqa_review.generate_report(args)
+    threads = []
+    query_last_comment = openqa_review.Issue._query_last_comment
+
+    def record_thread(issue):
+        threads.append(threading.current_thread())
+        return query_last_comment(issue)
+    monkeypatch.setattr(openqa_review.Issue, '_query_last_comment', record_thread)
+    openqa_review.reminder_comment_on_issues(report)
+    assert threads and threading.current_thread() not in threads
+    # worker threads are not marked as querying anymore for later tasks
+    assert not report.issue_executor.submit(lambda: getattr(openqa_review._querying, 'active', False)).result()
+    report.close()
+    args.dry_run = False
+
+
+def test_reminder_comments_are_skipped_on_timeouts(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    report = openqa_review.generate_report(args)
+    requested = []
+
+    def request(method, url, **kwargs):
+        requested.append(url)
+        raise requests.exceptions.ReadTimeout('Read timed out')
+    for browser in (report.progress_browser, report.bugzilla_browser):
+        browser.session = lambda url: Namespace(request=request)
+    openqa_review.reminder_comment_on_issues(report, min_days_unchanged=0)
+    # bugzilla and redmine issues are tried
+    assert any('jsonrpc.cgi' in url for url in requested) and any('/issues/' in url for url in requested)
+
+
+def test_reminder_comments_are_skipped_after_deadline(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    report = openqa_review.generate_report(args)
+    commented = []
+
+    def add_comment(issue, comment):
+        commented.append(issue.bugref)
+        raise DeadlineExceededError('Deadline exceeded, not retrieving %s' % issue.bugref_href)
+    monkeypatch.setattr(openqa_review.Issue, 'add_comment', add_comment)
+    openqa_review.reminder_comment_on_issues(report, min_days_unchanged=0)
+    # the remaining issues are still tried
+    assert len(commented) > 1
+
+
 def test_custom_reports_based_on_issue_status():
     args = bugrefs_test_args_factory()
     args.verbose_test = 1
@@ -477,6 +948,225 @@ def test_custom_reports_based_on_issue_status():
     compare_report(report, os.path.join(args.load_dir, 'report25_bugrefs_query_issues_filter_closed.md'))
 
 
+def test_filters_skip_entries_without_issue_early():
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    args.filter = 'closed'
+    report = openqa_review.generate_report(args)
+    ar = list(list(report.report.values())[0].reports.values())[0]
+    assert not any(ar.issues[issue_status]['todo'] for issue_status in ('new', 'existing'))
+    openqa_review.filter_report(report, openqa_review.ie_filters[args.filter])
+    compare_report(report, os.path.join(args.load_dir, 'report25_bugrefs_query_issues_filter_closed.md'))
+
+    sys.argv[1:] = ['--filter', 'foo']
+    with pytest.raises(SystemExit):
+        openqa_review.parse_args()
+
+
+@pytest.mark.skipif(not openqa_review.markdown_available, reason="needs the python module 'markdown' for the HTML output")
+def test_multiple_outputs_are_rendered_from_one_report():
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    report = openqa_review.generate_report(args)
+    with TemporaryDirectory() as tmp_dir:
+        outputs = ['md:%s/report.md' % tmp_dir, 'md+closed:%s/closed.md' % tmp_dir, 'md+unassigned:%s/unassigned.md' % tmp_dir,
+                   'html+closed:%s/closed.html' % tmp_dir]
+        sys.argv[1:] = ['--output=' + output for output in outputs]
+        for output in openqa_review.parse_args().output:
+            openqa_review.write_output(report, *output)
+        for name, ref in [('report.md', 'report25_bugrefs_query_issues.md'), ('closed.md', 'report25_bugrefs_query_issues_filter_closed.md'),
+                          ('unassigned.md', 'report25_bugrefs_query_issues_filter_unassigned.md')]:
+            compare_report(open(os.path.join(tmp_dir, name)).read(), os.path.join(args.load_dir, ref))
+        assert open(os.path.join(tmp_dir, 'closed.html')).read().startswith('<h1>')
+    # the report itself is not changed by filtered outputs
+    compare_report(report, os.path.join(args.load_dir, 'report25_bugrefs_query_issues.md'))
+
+    for output in ['pdf:report.pdf', 'md+foo:report.md', 'md']:
+        with pytest.raises(SystemExit):
+            sys.argv[1:] = ['--output', output]
+            openqa_review.parse_args()
+
+
+def test_job_groups_can_be_streamed_as_soon_as_processed():
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    report = openqa_review.generate_report(args, stream=True)
+    assert not report.report
+    with TemporaryDirectory() as tmp_dir:
+        outputs = [('md', None, os.path.join(tmp_dir, 'report.md')), ('md', 'closed', os.path.join(tmp_dir, 'closed.md'))]
+        openqa_review.stream_outputs(report, outputs)
+        compare_report(open(outputs[0][2]).read(), os.path.join(args.load_dir, 'report25_bugrefs_query_issues.md'))
+        compare_report(open(outputs[1][2]).read(), os.path.join(args.load_dir, 'report25_bugrefs_query_issues_filter_closed.md'))
+    assert all(not bug.pending for bug in report.issue_registry.values())
+    compare_report(report, os.path.join(args.load_dir, 'report25_bugrefs_query_issues.md'))
+
+
+def test_results_of_identical_overview_pages_are_not_extracted_again(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    with TemporaryDirectory() as tmp_dir:
+        args.results_cache_dir = tmp_dir
+        report = openqa_review.generate_report(args)
+        assert len(open_store(tmp_dir).urls()) == 2
+
+        def parse_overview(*args, **kwargs):
+            raise AssertionError('identical overview pages must not be parsed again')
+        monkeypatch.setattr(openqa_review, 'parse_overview', parse_overview)
+        cached_report = openqa_review.generate_report(args)
+    assert re.sub('Date: .*', '', str(cached_report)) == re.sub('Date: .*', '', str(report))
+
+
+def test_results_cache_is_opened_once_per_run_and_closed(monkeypatch):
+    args = cache_test_args_factory()
+    args.arch = None
+    args.job_group_urls = ','.join(args.host + '/group_overview/%i' % i for i in [25, 26, 4])
+    stores, opened = [], []
+
+    def open_store_recording(path, backend='directory', max_size=None):
+        store = open_store(path, backend, max_size)
+        stores.append((store, max_size))
+        opened.append(max_size)
+        return Namespace(get=store.get, put=store.put, close=lambda: stores.remove((store, max_size)))
+    monkeypatch.setattr(openqa_review, 'open_store', open_store_recording)
+    with TemporaryDirectory() as tmp_dir:
+        args.results_cache_dir = tmp_dir
+        args.cache_max_size = 10 ** 6
+        report = openqa_review.generate_report(args)
+        assert open_store(tmp_dir).urls()
+    assert len(report.report) == 3
+    # one store for all job groups limited in size and closed again
+    assert opened == [10 ** 6]
+    assert stores == []
+
+
+def test_unchanged_job_groups_are_reused_from_state_file(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    with TemporaryDirectory() as tmp_dir:
+        args.state_file = os.path.join(tmp_dir, 'state')
+        open(args.state_file, 'w').write('garbage')
+        report = openqa_review.generate_report(args)
+        compare_report(report, os.path.join(args.load_dir, 'report25_bugrefs_query_issues.md'))
+        # credentials of the issue trackers are not written into the state file
+        state = open(args.state_file, 'rb').read()
+        assert b'0123456789ABCDEF' not in state
+        assert openqa_review.config.get('product_issues', 'password').encode() not in state
+
+        def parse_overview(*args, **kwargs):
+            raise AssertionError('overview pages of unchanged job groups must not be parsed')
+        with monkeypatch.context() as m:
+            m.setattr(openqa_review, 'parse_overview', parse_overview)
+            report = openqa_review.generate_report(args)
+            # issues are queried again for the reused report
+            assert all(bug.queried or bug.error for bug in report.issue_registry.values())
+            compare_report(report, os.path.join(args.load_dir, 'report25_bugrefs_query_issues.md'))
+            # different options yield a different report
+            args.verbose_test = 2
+            with pytest.raises(AssertionError):
+                openqa_review.generate_report(args)
+
+
+def test_job_groups_missing_content_are_not_reused_from_state_file(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.include_softfails = True
+    get_url_to_softfailed_module = openqa_review.ArchReport._get_url_to_softfailed_module
+    failing_jobs = []
+
+    def get_url_failing_for_one_job(self, job_url):
+        if not failing_jobs or job_url == failing_jobs[0]:
+            failing_jobs.append(job_url)
+            raise openqa_review.DownloadError('failed to retrieve %s' % job_url)
+        return get_url_to_softfailed_module(self, job_url)
+    with TemporaryDirectory() as tmp_dir:
+        args.state_file = os.path.join(tmp_dir, 'state')
+        with monkeypatch.context() as m:
+            m.setattr(openqa_review.ArchReport, '_get_url_to_softfailed_module', get_url_failing_for_one_job)
+            report = openqa_review.generate_report(args)
+        assert failing_jobs
+        assert not all(pr.complete for pr in report.report.values())
+        assert openqa_review.load_state(args.state_file) == {}
+        # the job group is processed again instead of reusing the report missing the bugref of the soft fail
+        report = openqa_review.generate_report(args)
+        compare_report(report, os.path.join(args.load_dir, 'report25_T_bugrefs_softfails.md'))
+        assert list(openqa_review.load_state(args.state_file)) == args.job_group_urls.split(',')
+
+
+def test_job_groups_processed_in_parallel_yield_same_report():
+    args = cache_test_args_factory()
+    args.arch = None
+    args.job_group_urls = ','.join(args.host + '/group_overview/%i' % i for i in [25, 26, 4])
+    report = openqa_review.generate_report(args)
+    args.jobs = 2
+    parallel_report = openqa_review.generate_report(args)
+    assert list(parallel_report.report.keys()) == list(report.report.keys())
+    # the current time is part of each product report
+    assert re.sub('Date: .*', '', str(parallel_report)) == re.sub('Date: .*', '', str(report))
+
+
+def test_job_groups_processed_in_parallel_without_pool_initializer(monkeypatch):
+    args = cache_test_args_factory()
+    args.arch = None
+    args.job_group_urls = ','.join(args.host + '/group_overview/%i' % i for i in [25, 26])
+    report = openqa_review.generate_report(args)
+    args.jobs = 2
+    # e.g. python versions before 3.7
+    monkeypatch.setattr(openqa_review, 'pool_initializer_available', False)
+    parallel_report = openqa_review.generate_report(args)
+    assert re.sub('Date: .*', '', str(parallel_report)) == re.sub('Date: .*', '', str(report))
+
+
+@pytest.mark.skipif(not openqa_review.pool_initializer_available, reason="needs the initializer of process pools")
+def test_worker_processes_get_config_and_browsers_passed_instead_of_inherited():
+    args = cache_test_args_factory()
+    args.arch = None
+    args.job_group_urls = ','.join(args.host + '/group_overview/%i' % i for i in [25, 26])
+    report = openqa_review.generate_report(args)
+    args.jobs = 2
+    start_method = multiprocessing.get_start_method()
+    openqa_review.config = ConfigParser()
+    openqa_review.config.add_section('max_connections')
+    try:
+        # new worker processes do not inherit the configuration of the main process
+        multiprocessing.set_start_method('spawn', force=True)
+        parallel_report = openqa_review.generate_report(args)
+    finally:
+        multiprocessing.set_start_method(start_method, force=True)
+        openqa_review.config = None
+    assert re.sub('Date: .*', '', str(parallel_report)) == re.sub('Date: .*', '', str(report))
+    # report links need the configuration within the worker process
+    args = bugrefs_test_args_factory()
+    args.report_links = True
+    browser = browser_factory(args)
+    root_url = openqa_review.get_root_url(args)
+    job_group_url = list(openqa_review.get_job_groups(browser, root_url, args).values())[0]
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'), initializer=openqa_review._init_worker,
+                               initargs=(openqa_review.config, browser, root_url, args, None, None))
+    pr = pool.submit(openqa_review._worker_product_report, job_group_url).result()
+    pool.shutdown()
+    pr.adopt(args, browser, None, None, {})
+    expected = str(openqa_review.product_report(browser, job_group_url, root_url, args))
+    assert re.sub('Date: .*', '', str(pr)) == re.sub('Date: .*', '', expected)
+
+
+def test_product_reports_can_be_transferred_between_processes():
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    report = openqa_review.generate_report(args)
+    pr = list(report.report.values())[0]
+    copied = pickle.loads(pickle.dumps(pr))
+    issue_registry = dict(report.issue_registry)
+    copied.adopt(args, report.browser, report.progress_browser, report.bugzilla_browser, issue_registry)
+    assert issue_registry == report.issue_registry
+    assert [id(bug) for bug in copied.bugs] == [id(bug) for bug in pr.bugs]
+    assert str(copied) == str(pr)
+
+
 def test_arch_distinguish():
     args = cache_test_args_factory()
     args.arch = None
@@ -484,3 +1174,355 @@ def test_arch_distinguish():
 
     report = str(openqa_review.generate_report(args))
     assert 'ppc64le' in report
+
+
+def test_browser_expire_keeps_content_which_never_changes():
+    browser = browser_factory(args_factory())
+    browser.cache.put('https://openqa.opensuse.org/tests/123', '<html/>', 7)
+    browser.cache.put(('soup', 'https://openqa.opensuse.org/tests/123'), '<html/>', 7)
+    browser.cache.put('https://openqa.opensuse.org/group_overview/25.json', '{}', 2)
+    # jobs not known to be finished can still change
+    browser.cache.put('https://openqa.opensuse.org/tests/124', '<html/>', 7)
+    browser.add_finished_jobs([123])
+    browser.expire()
+    assert browser.cache.keys() == ['https://openqa.opensuse.org/tests/123', ('soup', 'https://openqa.opensuse.org/tests/123')]
+
+
+def test_report_server_serves_refreshed_report_in_all_formats(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    report_server = server.ReportServer(args)
+    http_server = server.create_server(report_server, 'localhost')
+    thread = threading.Thread(target=http_server.serve_forever)
+    thread.start()
+    try:
+        url = 'http://localhost:%i' % http_server.server_address[1]
+        assert requests.get(url + '/').status_code == 503
+        report_server.refresh()
+        served = report_server.report
+        issues = dict(report_server.issue_registry)
+        assert issues
+        # issue trackers are asked again for content which can change
+        report_server.progress_browser.cache.put('https://progress.opensuse.org/issues/1.json', '{}', 2)
+        query_issues = openqa_review.query_issues
+        rendered_while_refreshing = []
+
+        def render_while_refreshing(*args, **kwargs):
+            rendered_while_refreshing.append(report_server.render('md', 'closed'))
+            return query_issues(*args, **kwargs)
+        with monkeypatch.context() as m:
+            m.setattr(openqa_review, 'query_issues', render_while_refreshing)
+            report_server.refresh()
+        # the served report keeps its issues until the new one is swapped in
+        compare_report(rendered_while_refreshing[0], os.path.join(args.load_dir, 'report25_bugrefs_query_issues_filter_closed.md'))
+        assert report_server.report is not served
+        assert report_server.report.issue_registry is report_server.issue_registry
+        assert all(issue is not issues[key] and (issue.queried or issue.error) for key, issue in iteritems(report_server.issue_registry))
+        assert all(issue.queried or issue.error for issue in issues.values())
+        # issues queried within the time to live are copied instead of queried again, others are queried
+        reused = [key for key, issue in iteritems(issues) if issue.fresh]
+        assert reused
+        assert all(report_server.issue_registry[key].queried_at == issues[key].queried_at for key in reused)
+        issues = dict(report_server.issue_registry)
+        for key in reused:
+            issues[key].queried_at -= 3600
+        report_server.refresh()
+        assert all(report_server.issue_registry[key].queried_at > issues[key].queried_at + 3600 for key in reused)
+        assert 'https://progress.opensuse.org/issues/1.json' not in report_server.progress_browser.cache.keys()
+        compare_report(requests.get(url + '/report.md').text, os.path.join(args.load_dir, 'report25_bugrefs_query_issues.md'))
+        compare_report(requests.get(url + '/?filter=closed').text, os.path.join(args.load_dir, 'report25_bugrefs_query_issues_filter_closed.md'))
+        groups = requests.get(url + '/report.json').json()['groups']
+        assert [g['name'] for g in groups] == list(report_server.report.report.keys())
+        # the optional python module 'markdown' is not part of the test dependencies
+        if openqa_review.markdown_available:
+            assert requests.get(url + '/report.html').text.startswith('<h1>')
+        else:
+            assert requests.get(url + '/report.html').status_code == 501
+        assert requests.get(url + '/?filter=foo').status_code == 400
+        assert requests.get(url + '/foo').status_code == 404
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+        thread.join()
+        report_server.close()
+
+
+def test_report_server_applies_filter_option():
+    args = bugrefs_test_args_factory()
+    args.verbose_test = 1
+    args.query_issue_status = True
+    args.filter = 'closed'
+    args.output = [('md', None, '-')]
+    report_server = server.ReportServer(args)
+    report_server.refresh()
+    compare_report(report_server.render('md'), os.path.join(args.load_dir, 'report25_bugrefs_query_issues_filter_closed.md'))
+    report_server.close()
+
+
+def test_report_links_are_only_generated_for_entries_kept_by_outputs(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.report_links = True
+    # a filter which does not need a referenced issue
+    monkeypatch.setitem(openqa_review.ie_filters, 'none', lambda ie: False)
+
+    def failures(report):
+        return [f for pr in report.report.values() for ar in pr.reports.values() for issue_types in ar.issues.values() for ies in issue_types.values()
+                for ie in ies if ie.test_browser for f in ie.failures]
+    args.output = [('md', 'none', '-')]
+    report = openqa_review.generate_report(args)
+    assert failures(report) and not any('report_link' in f for f in failures(report))
+    args.output.append(('md', None, '-'))
+    assert all('report_link' in f for f in failures(openqa_review.generate_report(args)))
+
+
+def test_softfailed_jobs_are_resolved_concurrently_isolating_errors(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.include_softfails = True
+    args.max_connections = 4
+    get_url_to_softfailed_module = openqa_review.ArchReport._get_url_to_softfailed_module
+    threads, jobs = set(), []
+
+    def get_url_recording_thread(self, job_url):
+        threads.add(threading.current_thread())
+        jobs.append(job_url)
+        return get_url_to_softfailed_module(self, job_url)
+    monkeypatch.setattr(openqa_review.ArchReport, '_get_url_to_softfailed_module', get_url_recording_thread)
+    report = openqa_review.generate_report(args)
+    compare_report(report, os.path.join(args.load_dir, 'report25_T_bugrefs_softfails.md'))
+    assert len(jobs) > 1
+    assert threading.current_thread() not in threads
+
+    failing_job = sorted(jobs)[0]
+
+    def get_url_failing_for_one_job(self, job_url):
+        if job_url == failing_job:
+            raise openqa_review.DownloadError('failed to retrieve %s' % job_url)
+        return get_url_to_softfailed_module(self, job_url)
+    monkeypatch.setattr(openqa_review.ArchReport, '_get_url_to_softfailed_module', get_url_failing_for_one_job)
+
+    def softfails_with_bugref(report):
+        ies = [ie for pr in report.report.values() for ar in pr.reports.values() for issue_types in ar.issues.values() for ies in issue_types.values()
+               for ie in ies]
+        return sorted(f['href'] for ie in ies for f in ie.failures if f['state'] in openqa_review.soft_fail_states and f.get('bugref_href'))
+    resolved = softfails_with_bugref(report)
+    assert failing_job in resolved
+    assert softfails_with_bugref(openqa_review.generate_report(args)) == [href for href in resolved if href != failing_job]
+
+
+def test_softfailed_jobs_are_looked_up_with_job_details_api_if_available(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.include_softfails = True
+    get_url_to_softfailed_module = openqa_review.ArchReport._get_url_to_softfailed_module
+    scraped = []
+
+    def get_url_recording_job(self, job_url):
+        scraped.append(job_url)
+        return get_url_to_softfailed_module(self, job_url)
+    monkeypatch.setattr(openqa_review.ArchReport, '_get_url_to_softfailed_module', get_url_recording_job)
+    report = openqa_review.generate_report(args)
+    compare_report(report, os.path.join(args.load_dir, 'report25_T_bugrefs_softfails.md'))
+    # only jobs without details from the API are scraped
+    assert '/tests/384707' not in scraped
+    assert '/tests/384330' in scraped
+
+
+def test_job_store_keeps_artifacts_of_jobs_until_not_accessed_anymore():
+    with TemporaryDirectory() as tmp_dir:
+        store = JobStore(os.path.join(tmp_dir, 'jobs.sqlite'))
+        store.put('https://openqa.opensuse.org/tests/overview?build=1', 'overview')
+        store.put('https://openqa.opensuse.org/tests/1', 'job 1')
+        store.put('https://openqa.opensuse.org/tests/1/file/details-welcome.json', '[]')
+        store.put('https://openqa.opensuse.org/api/v1/jobs/2/details', '{}')
+        assert store.jobs() == ['openqa.opensuse.org/1', 'openqa.opensuse.org/2']
+        assert store.get('https://openqa.opensuse.org/tests/overview?build=1') is None
+        assert store.get('https://openqa.opensuse.org/tests/1') == 'job 1'
+        store.gc(60, now=time.time() + 3600)
+        assert store.jobs() == []
+        # access times are written deferred
+        store.put('https://openqa.opensuse.org/tests/3', 'job 3')
+        store._db.execute("UPDATE artifacts SET atime = 0")
+        assert store.get('https://openqa.opensuse.org/tests/3') == 'job 3'
+        store.close()
+        store = JobStore(os.path.join(tmp_dir, 'jobs.sqlite'))
+        store.gc(60)
+        assert store.jobs() == ['openqa.opensuse.org/3']
+        store.close()
+
+
+def test_browser_retrieves_artifacts_of_jobs_only_once_with_job_cache():
+    args = cache_test_args_factory()
+    args.load_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'tags_labels')
+    with TemporaryDirectory() as tmp_dir:
+        args.job_cache_dir = tmp_dir
+        browser = browser_factory(args)
+        # artifacts of jobs not known to be finished are not kept
+        browser.get_page('/tests/384707')
+        assert browser.job_store.jobs() == []
+        browser.cache.clear()
+        browser.add_finished_jobs([384707])
+        page = browser.get_page('/tests/384707')
+        details = browser.get_json('/api/v1/jobs/384707/details')
+        browser.get_json('https://openqa.opensuse.org/group_overview/25.json')
+        # another run not finding any content except in the job cache
+        args.load_dir = tmp_dir
+        browser = browser_factory(args)
+        browser.add_finished_jobs([384707])
+        assert browser.get_page('/tests/384707') == page
+        assert browser.get_json('/api/v1/jobs/384707/details') == details
+        with pytest.raises(openqa_review.DownloadError):
+            browser.get_json('https://openqa.opensuse.org/group_overview/25.json')
+        assert browser.job_store.jobs() == ['openqa.opensuse.org/384707']
+        # old jobs are only removed once per run, not by each browser
+        args.job_cache_max_age = 0
+        browser = browser_factory(args)
+        assert browser.job_store.jobs() == ['openqa.opensuse.org/384707']
+        browser.gc_job_store()
+        assert browser.job_store.jobs() == []
+
+
+def test_report_links_are_generated_before_rendering_reading_config_once(monkeypatch):
+    args = bugrefs_test_args_factory()
+    args.report_links = True
+    args.max_connections = 4
+    report_link_config = openqa_review.report_link_config
+    calls = []
+
+    def report_link_config_counting_calls(root_url):
+        calls.append(root_url)
+        return report_link_config(root_url)
+    monkeypatch.setattr(openqa_review, 'report_link_config', report_link_config_counting_calls)
+    report = openqa_review.generate_report(args)
+    assert len(calls) == 1
+    ies = [ie for pr in report.report.values() for ar in pr.reports.values() for issue_types in ar.issues.values() for ies in issue_types.values()
+           for ie in ies if ie.test_browser]
+    assert ies and all('report_link' in f for ie in ies for f in ie.failures)
+    # rendering does not need the browser anymore
+    report.browser.get_page = None
+    compare_report(str(report), os.path.join(args.load_dir, 'report25_T_bugrefs.md'))
+
+
+def fake_session_factory(status_codes):
+    session = Namespace(status_codes=list(status_codes), requests=[])
+
+    def get(url, **kwargs):
+        session.requests.append((url, kwargs['timeout']))
+        return Namespace(status_code=session.status_codes.pop(0), content=b'content')
+    session.get = get
+    return session
+
+
+def test_job_details_api_is_not_tried_again_once_not_found():
+    args = args_factory()
+    browser = openqa_review.Browser(args, 'https://openqa.opensuse.org')
+    session = fake_session_factory([404])
+    browser.session = lambda url: session
+    report = Namespace(test_browser=browser, root_url=browser.root_url)
+    for job_url in ['/tests/1', '/tests/2']:
+        assert openqa_review.ArchReport._get_softfailed_details_from_api(report, job_url) is None
+    assert session.requests == [('https://openqa.opensuse.org/api/v1/jobs/1/details', (10, 60))]
+    # other errors do not rule out the API
+    browser.expire()
+    session.status_codes = [500, 404]
+    for job_url in ['/tests/1', '/tests/2']:
+        assert openqa_review.ArchReport._get_softfailed_details_from_api(report, job_url) is None
+    assert len(session.requests) == 3
+
+
+def test_browser_retries_with_backoff_and_does_not_retry_failed_urls(monkeypatch):
+    args = args_factory()
+    args.read_timeout = 30
+    browser = openqa_review.Browser(args, 'https://openqa.opensuse.org')
+    session = fake_session_factory([502, 502, 200, 404])
+    browser.session = lambda url: session
+    sleeps = []
+    monkeypatch.setattr('openqa_review.browser.time.sleep', sleeps.append)
+    assert browser.get_page('/tests/1') == 'content'
+    assert sleeps == [1, 2]
+    assert session.requests[0] == ('https://openqa.opensuse.org/tests/1', (10, 30))
+    for _ in range(2):
+        with pytest.raises(openqa_review.DownloadError):
+            browser.get_page('/tests/2')
+    assert len(session.requests) == 4
+
+    # requests are limited by the deadline and not issued anymore after it
+    args.deadline_at = time.time() + 5
+    session.status_codes = [200]
+    browser.get_page('/tests/3')
+    assert session.requests[-1][1][1] <= 5
+    args.deadline_at = time.time()
+    with pytest.raises(DeadlineExceededError):
+        browser.get_page('/tests/4')
+    assert len(session.requests) == 5
+
+
+def test_job_groups_not_finished_before_deadline_are_marked_in_partial_report(monkeypatch):
+    args = cache_test_args_factory()
+    args.arch = None
+    args.job_group_urls = ','.join(args.host + '/group_overview/%i' % i for i in [25, 26, 4])
+    report = str(openqa_review.generate_report(args))
+    product_report = openqa_review.ProductReport
+
+    def product_report_failing_for_one_group(browser, job_group_url, *args, **kwargs):
+        if job_group_url.endswith('/26'):
+            raise DeadlineExceededError('deadline exceeded')
+        return product_report(browser, job_group_url, *args, **kwargs)
+    monkeypatch.setattr(openqa_review, 'ProductReport', product_report_failing_for_one_group)
+    with pytest.raises(openqa_review.DownloadError):
+        openqa_review.generate_report(args)
+    args.deadline = 3600
+    partial_report = openqa_review.generate_report(args)
+    unfinished = [k for k, v in iteritems(partial_report.report) if not isinstance(v, product_report)]
+    assert len(unfinished) == 1
+    assert 'Unfinished' in str(partial_report) and 'Unfinished' not in report
+    # all job groups are skipped after the deadline
+    args.deadline = 1e-6
+    assert all('Unfinished' in str(v) for v in openqa_review.generate_report(args).report.values())
+
+
+def test_optional_config_provides_connection_limits_per_host(monkeypatch):
+    monkeypatch.setattr(openqa_review, 'config', None)
+    args = args_factory()
+    args.max_connections = 4
+    with TemporaryDirectory() as tmp_dir:
+        monkeypatch.setattr(openqa_review, 'CONFIG_PATH', os.path.join(tmp_dir, 'missing'))
+        openqa_review.load_config(required=False)
+        assert openqa_review.max_connections(args, 'https://openqa.opensuse.org/') == 4
+        config_path = os.path.join(tmp_dir, 'openqa_reviewrc')
+        with open(config_path, 'w') as f:
+            f.write('[max_connections]\nopenqa.opensuse.org = 2\n')
+        monkeypatch.setattr(openqa_review, 'CONFIG_PATH', config_path)
+        openqa_review.load_config(required=False)
+        assert openqa_review.max_connections(args, 'https://openqa.opensuse.org/') == 2
+
+
+def test_directory_store_evicts_least_recently_accessed_files_above_max_size():
+    with TemporaryDirectory() as tmp_dir:
+        store = open_store(tmp_dir, 'directory', max_size=250)
+        for i in range(1, 4):
+            store.put('/tests/%i' % i, 'x' * 100)
+            os.utime(os.path.join(tmp_dir, ':tests:%i' % i), (i, i))
+        assert store.urls() == ['/tests/2', '/tests/3']
+        # the size of replaced files is not counted anymore
+        store.put('/tests/3', 'x' * 10)
+        assert store._size == 110
+
+
+def test_directory_store_keeps_long_urls_stored_concurrently():
+    with TemporaryDirectory() as tmp_dir:
+        store = open_store(tmp_dir, 'directory')
+        urls = ['/tests/overview?%i=%s' % (i, 'x' * 300) for i in range(20)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda url: store.put(url, 'content'), urls))
+        assert sorted(store.urls()) == sorted(urls)
+
+
+def test_overview_results_are_indexed_by_architecture():
+    args = cache_test_args_factory()
+    args.load_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'tags_labels')
+    page = browser_factory(args).get_page('/tests/overview?distri=opensuse&version=42.1&build=1507&groupid=25')
+    details = openqa_review.parse_overview(page)
+    assert details.archs == {'aarch64', 'arm', 'i586', 'x86_64'}
+    for arch in details.archs:
+        assert details.arch_results(arch) == {k: v for k, v in iteritems(details.results) if arch + '_' in k}
+    assert sum(len(details.arch_results(arch)) for arch in details.archs) == len(details.results)